@@ -1,32 +1,88 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
+import math
 from asyncio import TimeoutError
+from typing import Any, Awaitable, Callable
 
 from aiohttp import ClientError
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.helpers import config_validation as cv
 
 from .const import (
-    CONF_HOST,
     CONF_KEEP_ALIVE_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DATA_SCHEDULER,
+    DATA_TARGET_INDEX,
+    DEFAULT_FLEET_CONCURRENCY,
+    DEFAULT_FLEET_TIMEOUT,
     DEFAULT_KEEP_ALIVE_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_PROFILE_DURATION,
+    MAX_PROFILE_DURATION,
     DOMAIN,
+    ENDPOINT_READ,
     PLATFORMS,
-    PROGRAM_PRESETS,
+    STATISTICS_REFRESH_INTERVAL,
+)
+from .commands import (
+    START_MODES,
+    STOP_COMMAND,
+    STOP_MODES,
+    async_clear_pending_options,
+    build_start_command,
 )
 from .coordinator import CandyBiancaCoordinator
+from .profiler import async_profile
+from .scheduler import async_get_scheduler
+from .targets import ATTR_HOST, async_get_target_index
 from .notifications import FinishNotificationManager
 from .wash_timer import WashTimerManager
-from .util import sanitize_program_url
 
 _LOGGER = logging.getLogger(__name__)
 
+ATTR_MAX_CONCURRENT = "max_concurrent"
+ATTR_TIMEOUT = "timeout"
+ATTR_DURATION = "duration"
+
+_POSITIVE_SECONDS = vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False))
+
+_FLEET_SCHEMA = {
+    **cv.ENTITY_SERVICE_FIELDS,
+    vol.Optional(ATTR_HOST): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_MAX_CONCURRENT, default=DEFAULT_FLEET_CONCURRENCY): vol.All(
+        vol.Coerce(int), vol.Range(min=1)
+    ),
+    vol.Optional(ATTR_TIMEOUT, default=DEFAULT_FLEET_TIMEOUT): _POSITIVE_SECONDS,
+}
+START_SCHEMA = vol.Schema(
+    {
+        **_FLEET_SCHEMA,
+        vol.Optional("program_preset"): cv.string,
+        vol.Optional("program_url"): cv.string,
+        vol.Optional("temp"): vol.Coerce(int),
+        vol.Optional("spin"): vol.Coerce(int),
+        vol.Optional("delay"): vol.Coerce(int),
+    }
+)
+STOP_SCHEMA = vol.Schema(_FLEET_SCHEMA)
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+        )
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """YAML setup not supported (integration is UI-based)."""
@@ -61,13 +117,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     keep_alive_seconds = entry.options.get(
         CONF_KEEP_ALIVE_INTERVAL, DEFAULT_KEEP_ALIVE_INTERVAL
     )
+    scheduler = async_get_scheduler(hass)
+    scheduler.async_set_request_limit(
+        entry.entry_id,
+        entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+    )
+    coordinator.client.request_slot = scheduler.async_request_slot
+    data["poll_unsub"] = scheduler.async_add_job(
+        f"{coordinator.host} poll",
+        coordinator.async_refresh,
+        lambda: coordinator.poll_interval,
+    )
+    data["statistics_unsub"] = scheduler.async_add_job(
+        f"{coordinator.host} statistics",
+        coordinator.async_refresh_statistics,
+        lambda: STATISTICS_REFRESH_INTERVAL,
+    )
     data["keep_alive_unsub"] = _setup_keep_alive(
-        hass, coordinator.host, keep_alive_seconds
+        hass, coordinator, keep_alive_seconds
     )
 
     entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_get_target_index(hass).async_add_entry(entry)
 
     if not hass.services.has_service(DOMAIN, "start"):
         _register_services(hass)
@@ -89,10 +164,24 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         timer: WashTimerManager | None = entry_data.get("timer_manager")
         if timer:
             timer.async_unload()
+        if poll_unsub := entry_data.get("poll_unsub"):
+            poll_unsub()
+        if statistics_unsub := entry_data.get("statistics_unsub"):
+            statistics_unsub()
         if keep_alive_unsub := entry_data.get("keep_alive_unsub"):
             keep_alive_unsub()
+        coordinator: CandyBiancaCoordinator | None = entry_data.get("coordinator")
+        if coordinator:
+            await coordinator.async_shutdown()
+        if index := hass.data.get(DATA_TARGET_INDEX):
+            index.async_remove_entry(entry.entry_id)
+        if scheduler := hass.data.get(DATA_SCHEDULER):
+            scheduler.async_set_request_limit(entry.entry_id, None)
         if not hass.data[DOMAIN]:
             hass.data.pop(DOMAIN, None)
+            hass.data.pop(DATA_SCHEDULER, None)
+            if index := hass.data.pop(DATA_TARGET_INDEX, None):
+                index.async_close()
 
     return unload_ok
 
@@ -101,148 +190,188 @@ async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> Non
     await hass.config_entries.async_reload(entry.entry_id)
 
 
-def _get_entry_data_for_entity(
-    hass: HomeAssistant, entity_id: str
-) -> tuple[str | None, ConfigEntry | None, dict | None]:
-    """Resolve config entry data for an entity belonging to this integration."""
-    ent_reg = er.async_get(hass)
-    entity = ent_reg.async_get(entity_id)
-    if entity is None or not entity.config_entry_id:
-        _LOGGER.error("Entity %s not found or has no config_entry_id", entity_id)
-        return None, None, None
-
-    entry = hass.config_entries.async_get_entry(entity.config_entry_id)
-    if entry is None:
-        _LOGGER.error("Config entry %s not found", entity.config_entry_id)
-        return None, None, None
-
-    host = entry.data.get(CONF_HOST)
-    if not host:
-        _LOGGER.error("No host in config entry %s", entry.entry_id)
-        return None, None, None
+async def _async_resolve_washers(hass: HomeAssistant, call: ServiceCall) -> list[dict]:
+    """Return the runtime data of the loaded washers a service call targets."""
+    entry_ids = await async_get_target_index(hass).async_resolve(call)
+    domain_data = hass.data.get(DOMAIN, {})
+    washers = []
+    for entry_id in entry_ids:
+        entry_data = domain_data.get(entry_id)
+        if entry_data is None or entry_data.get("coordinator") is None:
+            _LOGGER.error("No runtime data for entry %s", entry_id)
+            continue
+        washers.append(entry_data)
+    return washers
+
+
+async def _async_send_command(
+    coordinator: CandyBiancaCoordinator,
+    params: str,
+    expected_modes: frozenset[int],
+    timeout: float,
+) -> dict[str, Any]:
+    """Send a command to one washer and wait until the status reflects it.
+
+    The result is "confirmed" (the status reflects the command), "sent"
+    (accepted but the status did not change) or "failed".
+    """
+    try:
+        async with asyncio.timeout(timeout):
+            outcome = await coordinator.async_send_command(params, expected_modes)
+    except (ClientError, TimeoutError) as err:
+        _LOGGER.error("Error calling Candy Bianca %s: %s", coordinator.host, err)
+        return _command_result("failed", error=str(err) or type(err).__name__)
 
-    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
-    if entry_data is None:
-        _LOGGER.error("No runtime data for entry %s", entry.entry_id)
-        return None, None, None
+    if not outcome.confirmed:
+        _LOGGER.warning(
+            "Candy Bianca %s accepted the command but its status did not change",
+            coordinator.host,
+        )
+        return _command_result("sent", attempts=outcome.attempts)
+    return _command_result(
+        "confirmed", latency=round(outcome.latency, 3), attempts=outcome.attempts
+    )
 
-    return host, entry, entry_data
 
+def _command_result(
+    result: str,
+    latency: float | None = None,
+    attempts: int = 0,
+    error: str | None = None,
+) -> dict[str, Any]:
+    return {"result": result, "latency": latency, "attempts": attempts, "error": error}
+
+
+async def _async_fan_out(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    command: Callable[[dict], Awaitable[dict[str, Any]]],
+) -> ServiceResponse:
+    """Run a command on every targeted washer, a few at a time."""
+    washers = await _async_resolve_washers(hass, call)
+    if not washers:
+        _LOGGER.error("candy_bianca.%s: no washer matches the target", call.service)
+        return {"washers": {}}
+
+    limit: int = call.data[ATTR_MAX_CONCURRENT]
+    semaphore = asyncio.Semaphore(limit)
+    # Each washer has `timeout` once it got a slot; this deadline also bounds
+    # the wait for the slot, so the call always ends.
+    deadline = asyncio.get_running_loop().time() + call.data[ATTR_TIMEOUT] * (
+        math.ceil(len(washers) / limit)
+    )
 
-async def _async_call_http(hass: HomeAssistant, host: str, params: str) -> None:
-    """Send a raw HTTP command to the washer."""
-    url = f"http://{host}/http-write.json?encrypted=0&{params}"
-    session = async_get_clientsession(hass)
-    _LOGGER.debug("Candy Bianca HTTP: %s", url)
-    try:
-        async with session.get(url, timeout=10) as resp:
-            resp.raise_for_status()
-    except (ClientError, TimeoutError) as err:
-        _LOGGER.error("Error calling Candy Bianca %s: %s", host, err)
+    async def _async_run(entry_data: dict) -> dict[str, Any]:
+        try:
+            async with asyncio.timeout_at(deadline):
+                async with semaphore:
+                    return await command(entry_data)
+        except TimeoutError:
+            _LOGGER.error(
+                "Candy Bianca %s: no time left for the command",
+                entry_data["coordinator"].host,
+            )
+            return _command_result("failed", error="Timed out waiting for a slot")
+
+    results = await asyncio.gather(*(_async_run(entry_data) for entry_data in washers))
+    return {
+        "washers": {
+            entry_data["coordinator"].host: result
+            for entry_data, result in zip(washers, results)
+        }
+    }
 
 
 def _setup_keep_alive(
-    hass: HomeAssistant, host: str, keep_alive_seconds: int
+    hass: HomeAssistant, coordinator: CandyBiancaCoordinator, keep_alive_seconds: int
 ):
     if keep_alive_seconds <= 0:
         return None
 
-    session = async_get_clientsession(hass)
+    host = coordinator.host
+    client = coordinator.client
 
-    async def _async_ping(_now):
-        url = f"http://{host}/http-read.json?encrypted=2"
-        _LOGGER.debug("Candy Bianca keep-alive: %s", url)
+    async def _async_ping() -> None:
+        if client.breaker.is_open:
+            # Paused until the breaker lets a probe through
+            if coordinator.keep_alive_updates:
+                coordinator.record_failure()
+            return
+        _LOGGER.debug("Candy Bianca keep-alive: %s", host)
         try:
-            async with session.get(url, timeout=5) as resp:
-                resp.raise_for_status()
-        except (ClientError, TimeoutError) as err:
+            if not coordinator.keep_alive_updates:
+                await client.async_ping(5)
+                return
+            data = await client.async_read(ENDPOINT_READ, 5)
+        except (ClientError, TimeoutError, ValueError) as err:
             _LOGGER.debug("Keep-alive failed for %s: %s", host, err)
+            if coordinator.keep_alive_updates:
+                # The keep-alive is the status source
+                coordinator.record_failure()
+            return
+
+        coordinator.async_handle_keep_alive(data)
 
-    return async_track_time_interval(
-        hass, _async_ping, timedelta(seconds=keep_alive_seconds)
+    return async_get_scheduler(hass).async_add_job(
+        f"{host} keep-alive", _async_ping, lambda: keep_alive_seconds
     )
 
 
 def _register_services(hass: HomeAssistant) -> None:
     """Register start/stop services."""
 
-    async def async_start(call: ServiceCall) -> None:
-        entity_id = call.data.get("entity_id")
-        if not entity_id:
-            _LOGGER.error("candy_bianca.start requires entity_id")
-            return
-
-        host, _entry, entry_data = _get_entry_data_for_entity(hass, entity_id)
-        if not host or not entry_data:
-            return
-
-        pending = entry_data.get("pending_options", {})
-        coordinator: CandyBiancaCoordinator | None = entry_data.get("coordinator")
-        status = coordinator.data if coordinator and coordinator.data else {}
-
-        # 1) explicit URL has priority
-        program_url: str = call.data.get("program_url", "")
-
-        # 2) otherwise use preset mapping
-        if not program_url:
-            preset = call.data.get("program_preset")
-            if preset:
-                program_url = PROGRAM_PRESETS.get(preset, "")
-            elif pending.get("program_preset"):
-                program_url = PROGRAM_PRESETS.get(
-                    pending.get("program_preset", ""), ""
+    async def async_start(call: ServiceCall) -> ServiceResponse:
+        timeout: float = call.data[ATTR_TIMEOUT]
+
+        async def _async_start_washer(entry_data: dict) -> dict[str, Any]:
+            coordinator: CandyBiancaCoordinator = entry_data["coordinator"]
+            pending = entry_data.get("pending_options", {})
+            params = build_start_command(
+                coordinator.data or {},
+                pending,
+                preset=call.data.get("program_preset"),
+                program_url=call.data.get("program_url"),
+                temp=call.data.get("temp"),
+                spin=call.data.get("spin"),
+                delay=call.data.get("delay"),
+            )
+            # Clear pending options after capturing them for this run
+            async_clear_pending_options(hass, coordinator.host, pending)
+
+            if entry_data.get("test_mode"):
+                _LOGGER.debug(
+                    "TEST mode: skipping call to %s with params %s",
+                    coordinator.host,
+                    params,
                 )
+                return _command_result("skipped", error="Test mode")
 
-        if not program_url and pending.get("program_url"):
-            program_url = pending.get("program_url", "")
-
-        program_url = sanitize_program_url(program_url)
-
-        temp = call.data.get("temp", pending.get("temperature"))
-        if temp is None:
-            temp = status.get("Temp")
+            return await _async_send_command(coordinator, params, START_MODES, timeout)
 
-        spin = call.data.get("spin", pending.get("spin"))
-        if spin is None:
-            spin = status.get("SpinSp")
+        return await _async_fan_out(hass, call, _async_start_washer)
 
-        delay = call.data.get("delay", pending.get("delay"))
-        if delay is None:
-            delay = 0 if program_url else status.get("DelVl")
+    async def async_stop(call: ServiceCall) -> ServiceResponse:
+        timeout: float = call.data[ATTR_TIMEOUT]
 
-        # Clear pending options after capturing them for this run
-        pending.clear()
+        async def _async_stop_washer(entry_data: dict) -> dict[str, Any]:
+            return await _async_send_command(
+                entry_data["coordinator"], STOP_COMMAND, STOP_MODES, timeout
+            )
 
-        parts: list[str] = ["Write=1", "StSt=1"]
-        if program_url:
-            parts.append(program_url)
-        if temp is not None:
-            parts.append(f"TmpTgt={int(temp)}")
-        if spin is not None:
-            parts.append(f"SpdTgt={int(spin)}")
-        if delay is not None:
-            parts.append(f"DelVl={int(delay)}")
+        return await _async_fan_out(hass, call, _async_stop_washer)
 
-        params = "&".join(parts)
+    async def async_profile_service(call: ServiceCall) -> ServiceResponse:
+        return await async_profile(hass, call.data[ATTR_DURATION])
 
-        if entry_data.get("test_mode"):
-            _LOGGER.debug("TEST mode: skipping call to %s with params %s", host, params)
-            return
-
-        await _async_call_http(hass, host, params)
-
-    async def async_stop(call: ServiceCall) -> None:
-        entity_id = call.data.get("entity_id")
-        if not entity_id:
-            _LOGGER.error("candy_bianca.stop requires entity_id")
-            return
-
-        host, _entry, _entry_data = _get_entry_data_for_entity(hass, entity_id)
-        if not host:
-            return
-
-        params = "Write=1&StSt=0&DelMd=0"
-        await _async_call_http(hass, host, params)
-
-    hass.services.async_register(DOMAIN, "start", async_start)
-    hass.services.async_register(DOMAIN, "stop", async_stop)
+    for service, handler, schema in (
+        ("start", async_start, START_SCHEMA),
+        ("stop", async_stop, STOP_SCHEMA),
+        ("profile", async_profile_service, PROFILE_SCHEMA),
+    ):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            handler,
+            schema=schema,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
@@ -0,0 +1,117 @@
+"""Circuit breaker protecting a washer that stopped answering."""
+from __future__ import annotations
+
+import logging
+import random
+from time import monotonic
+
+from aiohttp import ClientConnectionError
+
+from .const import (
+    BREAKER_BACKOFF_BASE,
+    BREAKER_BACKOFF_MAX,
+    BREAKER_FAILURE_THRESHOLD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ClientConnectionError):
+    """Raised instead of contacting a washer known to be unreachable."""
+
+
+class CircuitBreaker:
+    """Track consecutive connection failures of one washer.
+
+    After a few failures in a row the circuit opens and requests fail
+    immediately. Once the backoff (exponential, with jitter) elapses a single
+    probe request is let through: success closes the circuit, failure opens
+    it again for twice as long.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        backoff_base: float = BREAKER_BACKOFF_BASE,
+        backoff_max: float = BREAKER_BACKOFF_MAX,
+    ) -> None:
+        self.host = host
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self._failure_threshold = failure_threshold
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._open_count = 0
+        self._retry_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """True while requests are being refused (no probe allowed yet)."""
+        if self.state == STATE_OPEN:
+            return monotonic() < self._retry_at
+        return self.state == STATE_HALF_OPEN and self._probe_in_flight
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed."""
+        if self.state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - monotonic())
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError if the request must not be sent."""
+        if self.state == STATE_CLOSED:
+            return
+        if self.state == STATE_OPEN:
+            if monotonic() < self._retry_at:
+                raise CircuitOpenError(
+                    f"{self.host} unreachable, retrying in {self.retry_in:.0f}s"
+                )
+            self.state = STATE_HALF_OPEN
+        if self._probe_in_flight:
+            raise CircuitOpenError(f"{self.host} unreachable, probe in progress")
+        self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        """The washer answered (any HTTP status)."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Candy Bianca %s is reachable again", self.host)
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self._open_count = 0
+        self._probe_in_flight = False
+
+    def record_cancelled(self) -> None:
+        """The request was abandoned before the washer could answer."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """The washer could not be reached."""
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if (
+            self.state == STATE_CLOSED
+            and self.consecutive_failures < self._failure_threshold
+        ):
+            return
+
+        backoff = min(
+            self._backoff_max, self._backoff_base * 2**self._open_count
+        ) * random.uniform(0.8, 1.2)
+        self._open_count += 1
+        self._retry_at = monotonic() + backoff
+        if self.state == STATE_CLOSED:
+            self.trips += 1
+            _LOGGER.warning(
+                "Candy Bianca %s unreachable, pausing requests for %.0fs",
+                self.host,
+                backoff,
+            )
+        self.state = STATE_OPEN
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from datetime import datetime
@@ -7,14 +8,19 @@ from datetime import datetime
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, DEFAULT_NAME, PROGRAM_PRESETS
+from .commands import (
+    START_MODES,
+    STOP_COMMAND,
+    STOP_MODES,
+    async_clear_pending_options,
+    build_start_command,
+)
+from .const import DOMAIN, DEFAULT_FLEET_TIMEOUT, DEFAULT_NAME
 from .coordinator import CandyBiancaCoordinator
-from .util import sanitize_program_url
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -70,9 +76,11 @@ class CandyBiancaBaseButton(ButtonEntity):
         self._last_action_success: bool | None = None
         self._last_action_detail: str | None = None
         self._last_action_time: datetime | None = None
+        self._last_action_queue_wait: float | None = None
+        self._last_action_latency: float | None = None
 
     @property
-    def extra_state_attributes(self) -> dict[str, str | bool | None]:
+    def extra_state_attributes(self) -> dict[str, str | bool | float | None]:
         """Expose metadata about the last button action."""
 
         return {
@@ -81,6 +89,8 @@ class CandyBiancaBaseButton(ButtonEntity):
             "last_action_time": self._last_action_time.isoformat()
             if self._last_action_time
             else None,
+            "last_action_queue_wait": self._last_action_queue_wait,
+            "last_action_latency": self._last_action_latency,
         }
 
     def _record_result(self, success: bool, detail: str | None = None) -> None:
@@ -97,20 +107,39 @@ class CandyBiancaBaseButton(ButtonEntity):
         )
         self.async_write_ha_state()
 
-    async def _async_call_http(self, params: str, action: str) -> bool:
-        url = f"http://{self._host}/http-write.json?encrypted=0&{params}"
-        session = async_get_clientsession(self.hass)
-        _LOGGER.debug("Candy Bianca Button HTTP: %s", url)
+    async def _async_send_command(
+        self, params: str, action: str, expected_modes: frozenset[int]
+    ) -> bool:
         try:
-            async with session.get(url, timeout=10) as resp:
-                resp.raise_for_status()
+            async with asyncio.timeout(DEFAULT_FLEET_TIMEOUT):
+                result = await self._coordinator.async_send_command(
+                    params, expected_modes
+                )
+        except TimeoutError:
+            message = (
+                f"{action} on {self._host} timed out after {DEFAULT_FLEET_TIMEOUT}s"
+            )
+            _LOGGER.error(message)
+            self._record_result(False, message)
+            return False
         except Exception as err:  # noqa: BLE001
             message = f"Error calling {action} on {self._host}: {err}"
             _LOGGER.error(message)
             self._record_result(False, message)
             return False
 
-        self._record_result(True, f"{action} command sent")
+        self._last_action_queue_wait = round(result.queue_wait, 3)
+        self._last_action_latency = (
+            round(result.latency, 2) if result.latency is not None else None
+        )
+        if not result.confirmed:
+            self._record_result(
+                False,
+                f"{action} command sent {result.attempts} times, "
+                "the washer status did not change",
+            )
+            return False
+        self._record_result(True, f"{action} confirmed by the washer")
         return True
 
 
@@ -123,48 +152,16 @@ class CandyBiancaStartButton(CandyBiancaBaseButton):
         self._pending = data.get("pending_options", {})
 
     async def async_press(self) -> None:
-        program_url = ""
-        if self._pending.get("program_preset"):
-            program_url = PROGRAM_PRESETS.get(self._pending.get("program_preset", ""), "")
-        elif self._pending.get("program_url"):
-            program_url = self._pending.get("program_url", "")
-
-        program_url = sanitize_program_url(program_url)
-
-        status = self._coordinator.data or {}
-
-        temp = self._pending.get("temperature")
-        if temp is None:
-            temp = status.get("Temp")
-
-        spin = self._pending.get("spin")
-        if spin is None:
-            spin = status.get("SpinSp")
-
-        delay = self._pending.get("delay")
-        if delay is None:
-            delay = 0 if program_url else status.get("DelVl")
-
-        parts: list[str] = ["Write=1", "StSt=1"]
-        if program_url:
-            parts.append(program_url)
-        if temp is not None:
-            parts.append(f"TmpTgt={int(temp)}")
-        if spin is not None:
-            parts.append(f"SpdTgt={int(spin)}")
-        if delay is not None:
-            parts.append(f"DelVl={int(delay)}")
-
-        params = "&".join(parts)
+        params = build_start_command(self._coordinator.data or {}, self._pending)
 
         if self._entry_data.get("test_mode"):
             _LOGGER.debug("TEST mode: skipping button call to %s with params %s", self._host, params)
             self._record_result(True, "Test mode: start command skipped")
-            self._pending.clear()
+            async_clear_pending_options(self.hass, self._host, self._pending)
             return
 
-        await self._async_call_http(params, "start program")
-        self._pending.clear()
+        await self._async_send_command(params, "start program", START_MODES)
+        async_clear_pending_options(self.hass, self._host, self._pending)
 
 
 class CandyBiancaStopButton(CandyBiancaBaseButton):
@@ -174,7 +171,7 @@ class CandyBiancaStopButton(CandyBiancaBaseButton):
         super().__init__(coordinator, entry, "stop_button", "Stop Program", "mdi:stop-circle-outline")
 
     async def async_press(self) -> None:
-        await self._async_call_http("Write=1&StSt=0&DelMd=0", "stop program")
+        await self._async_send_command(STOP_COMMAND, "stop program", STOP_MODES)
 
 
 class CandyBiancaRefreshButton(CandyBiancaBaseButton):
@@ -0,0 +1,206 @@
+"""Capture raw washer responses to JSONL files and replay them."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import time
+from typing import TYPE_CHECKING, NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import slugify
+
+from .const import (
+    CAPTURE_BACKUPS,
+    CAPTURE_BATCH_SIZE,
+    CAPTURE_FLUSH_INTERVAL,
+    CAPTURE_MAX_BYTES,
+    DOMAIN,
+    ENDPOINT_STATISTICS,
+)
+from .payload import loads
+
+if TYPE_CHECKING:
+    from .coordinator import CandyBiancaCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CapturedResponse(NamedTuple):
+    """One response read back from a capture file."""
+
+    time: float  # epoch seconds when it was received
+    endpoint: str
+    body: bytes
+
+
+def capture_path(hass: HomeAssistant, host: str, compress: bool) -> Path:
+    """Return the capture file of a washer in the configuration directory."""
+    extension = ".jsonl.gz" if compress else ".jsonl"
+    return Path(hass.config.path(DOMAIN, f"capture_{slugify(host)}{extension}"))
+
+
+class TrafficCapture:
+    """Append raw responses to a rotating, size-capped JSONL file.
+
+    Responses are only buffered on the event loop; encoding, compression
+    and file I/O happen in batches in the executor. Once the file exceeds
+    the size cap it is rotated, keeping a few older files.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: Path,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        backups: int = CAPTURE_BACKUPS,
+    ) -> None:
+        self._hass = hass
+        self.path = path
+        self._compress = path.suffix == ".gz"
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._buffer: list[CapturedResponse] = []
+        self._flush: asyncio.Future | None = None
+        self.written = 0
+        self._unsub_timer = async_track_time_interval(
+            hass, self._async_flush_tick, timedelta(seconds=CAPTURE_FLUSH_INTERVAL)
+        )
+
+    @callback
+    def record(self, endpoint: str, body: bytes) -> None:
+        """Buffer a response received from the washer."""
+        self._buffer.append(CapturedResponse(time(), endpoint, body))
+        if len(self._buffer) >= CAPTURE_BATCH_SIZE:
+            self._async_flush()
+
+    @callback
+    def _async_flush_tick(self, _now: datetime) -> None:
+        self._async_flush()
+
+    @callback
+    def _async_flush(self) -> None:
+        if not self._buffer or (self._flush is not None and not self._flush.done()):
+            # The running write picks up the rest on the next tick
+            return
+        batch, self._buffer = self._buffer, []
+        self._flush = self._hass.async_add_executor_job(self._write, batch)
+
+    async def async_close(self) -> None:
+        """Stop the timer and write what is still buffered."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._flush is not None:
+            await self._flush
+        self._async_flush()
+        if self._flush is not None:
+            await self._flush
+
+    def _write(self, batch: list[CapturedResponse]) -> None:
+        data = "".join(
+            json.dumps(
+                {
+                    "t": round(response.time, 3),
+                    "endpoint": response.endpoint,
+                    "body": response.body.decode("utf-8", errors="replace"),
+                },
+                separators=(",", ":"),
+            )
+            + "\n"
+            for response in batch
+        ).encode()
+        if self._compress:
+            # Each batch is a gzip member; readers decode them in sequence.
+            # Compressed first, so the size cap applies to the bytes on disk.
+            data = gzip.compress(data)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if (
+                self.path.exists()
+                and self.path.stat().st_size + len(data) > self._max_bytes
+            ):
+                self._rotate()
+            with self.path.open("ab") as file:
+                file.write(data)
+        except OSError as err:
+            _LOGGER.warning(
+                "Unable to write Candy Bianca capture %s: %s", self.path, err
+            )
+            return
+        self.written += len(batch)
+
+    def _rotate(self) -> None:
+        for index in range(self._backups, 0, -1):
+            source = _backup_path(self.path, index - 1)
+            if source.exists():
+                source.replace(_backup_path(self.path, index))
+
+
+def _backup_path(path: Path, index: int) -> Path:
+    # capture.jsonl.gz -> capture.1.jsonl.gz, so rotated files keep their type
+    if index == 0:
+        return path
+    extension = ".jsonl.gz" if path.name.endswith(".jsonl.gz") else path.suffix
+    stem = path.name.removesuffix(extension)
+    return path.with_name(f"{stem}.{index}{extension}")
+
+
+def read_capture(
+    path: Path, backups: int = CAPTURE_BACKUPS
+) -> list[CapturedResponse]:
+    """Read a capture and its rotated files, oldest response first."""
+    responses: list[CapturedResponse] = []
+    for index in range(backups, -1, -1):
+        file_path = _backup_path(path, index)
+        if not file_path.exists():
+            continue
+        opener = gzip.open if file_path.suffix == ".gz" else open
+        with opener(file_path, "rb") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = loads(line)
+                responses.append(
+                    CapturedResponse(
+                        record["t"], record["endpoint"], record["body"].encode()
+                    )
+                )
+    return responses
+
+
+async def async_replay(
+    coordinator: CandyBiancaCoordinator,
+    responses: list[CapturedResponse],
+    speed: float | None = 1.0,
+) -> int:
+    """Feed captured responses through the coordinator and its entities.
+
+    Replay does no I/O: statistics are only taken from the capture, never
+    fetched from the washer. With `speed` set, the original spacing is
+    kept (2.0 replays twice as fast); with None, responses are replayed as
+    fast as the listeners process them. Return the number of responses
+    replayed.
+    """
+    if not responses:
+        return 0
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    origin = responses[0].time
+    for response in responses:
+        if speed:
+            delay = started + (response.time - origin) / speed - loop.time()
+            await asyncio.sleep(max(0.0, delay))
+        else:
+            # Let entity and manager callbacks run between responses
+            await asyncio.sleep(0)
+        data = loads(response.body)
+        if response.endpoint == ENDPOINT_STATISTICS:
+            coordinator.async_handle_statistics(data)
+        else:
+            coordinator.async_handle_keep_alive(data, refresh_statistics=False)
+    return len(responses)
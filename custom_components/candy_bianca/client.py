@@ -0,0 +1,417 @@
+"""HTTP client dedicated to a single Candy Bianca washer."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager, nullcontext
+from dataclasses import dataclass, field
+from collections import deque
+from itertools import count
+from time import monotonic, time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionReuseconnParams,
+)
+
+from homeassistant.const import __version__ as HA_VERSION
+
+from .breaker import CircuitBreaker, CircuitOpenError
+from .const import (
+    CONNECT_TIMEOUT,
+    CONNECTION_KEEP_ALIVE_TIMEOUT,
+    DEFAULT_READ_FRESHNESS,
+    DNS_CACHE_TTL,
+    ENDPOINT_READ,
+    ENDPOINT_STATISTICS,
+    ENDPOINT_WRITE,
+    TRACE_HISTORY_SIZE,
+)
+from .metrics import (
+    KIND_KEEP_ALIVE,
+    KIND_READ,
+    KIND_STATISTICS,
+    KIND_WRITE,
+    REQUEST_KINDS,
+    RequestMetrics,
+)
+from .payload import PayloadHistory, loads
+
+_LOGGER = logging.getLogger(__name__)
+
+# Queue priorities: lower runs first
+PRIORITY_WRITE = 0
+PRIORITY_READ = 1
+PRIORITY_BACKGROUND = 2  # optional reads (statistics)
+PRIORITY_PING = 3
+
+_ENDPOINT_KINDS = {ENDPOINT_READ: KIND_READ, ENDPOINT_STATISTICS: KIND_STATISTICS}
+
+
+@dataclass(order=True)
+class _QueuedRequest:
+    """A request waiting for its turn on the washer connection."""
+
+    priority: int
+    sequence: int
+    call: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    queued_at: float = field(compare=False)
+    kind: str = field(compare=False)
+    # Endpoint and single-flight task of a read
+    endpoint: str | None = field(compare=False, default=None)
+    owner: asyncio.Task | None = field(compare=False, default=None)
+
+
+class CandyBiancaClient:
+    """Own a tuned connection pool and send every request to one washer.
+
+    The embedded web server copes badly with parallel connections, so the
+    connector keeps at most one persistent connection per host and reuses it
+    for reads, writes and keep-alive pings instead of handshaking each time.
+
+    Reads are single-flight: callers asking for an endpoint while a read of it
+    is in progress share its result, and a result younger than the freshness
+    window is returned without contacting the washer at all.
+
+    All traffic is serialised through a priority queue so that start/stop
+    commands never wait behind status reads and keep-alive pings.
+
+    A circuit breaker stops contacting a washer that does not answer (e.g.
+    powered off) and lets a single probe through after a growing backoff.
+    """
+
+    def __init__(self, host: str, freshness: float = DEFAULT_READ_FRESHNESS) -> None:
+        self.host = host
+        self.freshness = freshness
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.requests = 0
+        self.coalesced_reads = 0
+        self.cached_reads = 0
+        self.breaker = CircuitBreaker(host)
+        self._session: ClientSession | None = None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._cache: dict[str, tuple[float, Any]] = {}
+        # Bumped by every write so reads started before it are not cached
+        self._generation = 0
+        # Every request to the washer goes through one priority queue
+        self._queue: asyncio.PriorityQueue[_QueuedRequest] = asyncio.PriorityQueue()
+        self._pending: list[_QueuedRequest] = []
+        # Last request the worker sent: it is on the wire, or its read is
+        # still single-flight until its callers are woken up
+        self._active: _QueuedRequest | None = None
+        self._sequence = count()
+        self._worker: asyncio.Task | None = None
+        self.dropped_pings = 0
+        self.last_write_wait = 0.0
+        self.max_write_wait = 0.0
+        self.metrics = {kind: RequestMetrics() for kind in REQUEST_KINDS}
+        self.payloads = PayloadHistory()
+        # Called with (endpoint, body) for every response read (capture mode)
+        self.on_response: Callable[[str, bytes], None] | None = None
+        # Slot shared with the other washers, held while a read is on the wire
+        self.request_slot: Callable[[], AbstractAsyncContextManager] | None = None
+        # (epoch, kind, queue wait, duration, outcome) of the last requests
+        self.traces: deque[tuple[float, str, float, float, str]] = deque(
+            maxlen=TRACE_HISTORY_SIZE
+        )
+
+    @property
+    def session(self) -> ClientSession:
+        """Return the client session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            trace = TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection_create)
+            trace.on_connection_reuseconn.append(self._on_connection_reuse)
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit=1,
+                    limit_per_host=1,
+                    keepalive_timeout=CONNECTION_KEEP_ALIVE_TIMEOUT,
+                    ttl_dns_cache=DNS_CACHE_TTL,
+                    use_dns_cache=True,
+                ),
+                headers={"User-Agent": f"HomeAssistant/{HA_VERSION} candy_bianca"},
+                trace_configs=[trace],
+            )
+        return self._session
+
+    async def async_read(
+        self, endpoint: str, timeout: float, priority: int = PRIORITY_READ
+    ) -> Any:
+        """Return the decoded JSON payload of a read-only endpoint.
+
+        The payload is shared with concurrent callers: treat it as read-only.
+        """
+        cached = self._cache.get(endpoint)
+        if cached is not None and monotonic() - cached[0] <= self.freshness:
+            self.cached_reads += 1
+            return cached[1]
+
+        task = self._inflight.get(endpoint)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._async_fetch(endpoint, timeout, priority)
+            )
+            self._inflight[endpoint] = task
+            task.add_done_callback(lambda done: self._async_read_done(endpoint, done))
+        else:
+            self.coalesced_reads += 1
+
+        # A cancelled caller must not cancel the read the others are awaiting
+        return await asyncio.shield(task)
+
+    async def async_ping(self, timeout: float) -> None:
+        """Read the status endpoint to keep the washer connection awake.
+
+        Any other request keeps the connection awake just as well, so a ping
+        queued behind traffic (or overtaken by a command) is dropped, and so
+        is a ping to a washer known to be offline.
+        """
+        if self._pending or self._inflight or self.breaker.is_open:
+            self.dropped_pings += 1
+            return
+        await self._async_enqueue(
+            PRIORITY_PING,
+            lambda: self._async_get(ENDPOINT_READ, timeout, None),
+            KIND_KEEP_ALIVE,
+        )
+
+    async def _async_fetch(self, endpoint: str, timeout: float, priority: int) -> Any:
+        return await self._async_enqueue(
+            priority,
+            lambda: self._async_get(endpoint, timeout, self._generation),
+            _ENDPOINT_KINDS.get(endpoint, KIND_READ),
+            endpoint,
+        )
+
+    async def _async_get(
+        self, endpoint: str, timeout: float, generation: int | None
+    ) -> Any:
+        url = f"http://{self.host}/{endpoint}?encrypted=2"
+        self.requests += 1
+        started = monotonic()
+        async with self.session.get(url, timeout=self._timeout(timeout)) as resp:
+            resp.raise_for_status()
+            body = await resp.read()
+        if generation is not None:
+            # Keep-alive ping bodies are not decoded nor worth keeping
+            self.payloads.add(endpoint, monotonic() - started, body)
+        if self.on_response is not None:
+            self.on_response(endpoint, body)
+        if generation is None:
+            return None
+        data = loads(body)
+        # Do not cache a state read before a command was queued
+        if generation == self._generation:
+            self._cache[endpoint] = (monotonic(), data)
+        return data
+
+    def _async_read_done(self, endpoint: str, task: asyncio.Task) -> None:
+        if self._inflight.get(endpoint) is task:
+            del self._inflight[endpoint]
+        # Retrieve the exception even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    async def async_write(self, params: str, timeout: float) -> float:
+        """Send a command to the washer, ahead of any queued read.
+
+        Reads still queued run after the command and are shared by every
+        later caller, so each endpoint is read once more after it.
+
+        Return how long the command waited in the queue, in seconds.
+        """
+        url = f"http://{self.host}/{ENDPOINT_WRITE}?encrypted=0&{params}"
+        _LOGGER.debug("Candy Bianca HTTP: %s", url)
+        # The command changes the washer state: cached reads are now stale,
+        # and reads issued from now on must not join the one already on the
+        # wire (its callers still get it, it is just no longer shared).
+        # Queued reads run after the command, so they stay shared.
+        self._cache.clear()
+        active = self._active
+        if (
+            active is not None
+            and active.endpoint is not None
+            and self._inflight.get(active.endpoint) is active.owner
+        ):
+            del self._inflight[active.endpoint]
+        self._generation += 1
+        # Pings are pointless once a command is on its way
+        for request in self._pending:
+            if request.priority == PRIORITY_PING and not request.future.done():
+                request.future.set_result(None)
+                self.dropped_pings += 1
+
+        async def _async_send() -> float:
+            self.requests += 1
+            async with self.session.get(
+                url, timeout=self._timeout(timeout)
+            ) as resp:
+                resp.raise_for_status()
+                await resp.read()
+            return self.last_write_wait
+
+        return await self._async_enqueue(PRIORITY_WRITE, _async_send, KIND_WRITE)
+
+    async def _async_enqueue(
+        self,
+        priority: int,
+        call: Callable[[], Awaitable[Any]],
+        kind: str,
+        endpoint: str | None = None,
+    ) -> Any:
+        """Queue a request and wait for the worker to run it."""
+        if self.breaker.is_open:
+            raise CircuitOpenError(f"{self.host} unreachable")
+        loop = asyncio.get_running_loop()
+        request = _QueuedRequest(
+            priority,
+            next(self._sequence),
+            call,
+            loop.create_future(),
+            monotonic(),
+            kind,
+            endpoint,
+            asyncio.current_task(),
+        )
+        self._pending.append(request)
+        self._queue.put_nowait(request)
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._async_worker())
+        return await request.future
+
+    async def _async_worker(self) -> None:
+        """Run queued requests one at a time, commands first."""
+        while True:
+            request = await self._queue.get()
+            self._pending.remove(request)
+            if request.future.done():
+                # Dropped, or its caller went away
+                continue
+
+            wait = monotonic() - request.queued_at
+            if request.priority == PRIORITY_WRITE:
+                self.last_write_wait = wait
+                self.max_write_wait = max(self.max_write_wait, wait)
+            try:
+                self.breaker.before_request()
+            except CircuitOpenError as err:
+                request.future.set_exception(err)
+                continue
+
+            # Reads share a few slots with the other washers; commands skip
+            # them (one queued meanwhile waits with the read ahead of it)
+            if self.request_slot is None or request.priority == PRIORITY_WRITE:
+                slot: AbstractAsyncContextManager = nullcontext()
+            else:
+                slot = self.request_slot()
+            try:
+                async with slot:
+                    started = monotonic()
+                    # Queue wait, including the wait for a shared slot
+                    wait = started - request.queued_at
+                    self._active = request
+                    result = await request.call()
+            except asyncio.CancelledError:
+                self.breaker.record_cancelled()
+                request.future.cancel()
+                raise
+            except (ClientConnectionError, TimeoutError) as err:
+                self.breaker.record_failure()
+                self._record(request, wait, started, type(err).__name__)
+                if not request.future.done():
+                    request.future.set_exception(err)
+            except Exception as err:  # noqa: BLE001
+                # HTTP or payload errors: the washer did answer
+                self.breaker.record_success()
+                self._record(request, wait, started, type(err).__name__)
+                if not request.future.done():
+                    request.future.set_exception(err)
+            else:
+                self.breaker.record_success()
+                self._record(request, wait, started, None)
+                if not request.future.done():
+                    request.future.set_result(result)
+
+    def _record(
+        self, request: _QueuedRequest, wait: float, started: float, error: str | None
+    ) -> None:
+        duration = monotonic() - started
+        self.metrics[request.kind].record(duration, error is None)
+        self.traces.append((time(), request.kind, wait, duration, error or "ok"))
+
+    @staticmethod
+    def _timeout(total: float) -> ClientTimeout:
+        # A dead host fails on the short connect timeout, a live but slow one
+        # gets the whole deadline to answer.
+        return ClientTimeout(total=total, sock_connect=CONNECT_TIMEOUT)
+
+    async def async_close(self) -> None:
+        """Close the pooled connections."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for request in self._pending:
+            request.future.cancel()
+        self._pending.clear()
+        self._active = None
+        self._queue = asyncio.PriorityQueue()
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
+        self._cache.clear()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def error_rate(self) -> float | None:
+        """Fraction of failed requests over the recent window of every kind."""
+        samples = sum(metrics.samples for metrics in self.metrics.values())
+        if not samples:
+            return None
+        errors = sum(metrics.window_errors for metrics in self.metrics.values())
+        return errors / samples
+
+    @property
+    def connection_stats(self) -> dict[str, int | float | str]:
+        """Return counters about connections, coalescing, queueing and breaker."""
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "coalesced_reads": self.coalesced_reads,
+            "cached_reads": self.cached_reads,
+            "dropped_pings": self.dropped_pings,
+            "queued_requests": len(self._pending),
+            "last_write_queue_wait": round(self.last_write_wait, 3),
+            "max_write_queue_wait": round(self.max_write_wait, 3),
+            "breaker_state": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+            "consecutive_failures": self.breaker.consecutive_failures,
+        }
+
+    async def _on_connection_create(
+        self,
+        _session: ClientSession,
+        _ctx: SimpleNamespace,
+        _params: TraceConnectionCreateEndParams,
+    ) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reuse(
+        self,
+        _session: ClientSession,
+        _ctx: SimpleNamespace,
+        _params: TraceConnectionReuseconnParams,
+    ) -> None:
+        self.connections_reused += 1
@@ -12,18 +12,46 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import selector
 
+from .client import CandyBiancaClient
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_CAPTURE_COMPRESS,
+    CONF_CAPTURE_TRAFFIC,
     CONF_FINISH_MESSAGE,
     CONF_FINISH_NOTIFICATION,
     CONF_HOST,
     CONF_KEEP_ALIVE_INTERVAL,
+    CONF_KEEP_ALIVE_UPDATES,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
     CONF_SATELLITE_ENTITY,
     CONF_TIMER_ENTITY,
     CONF_SCAN_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_CAPTURE_COMPRESS,
+    DEFAULT_CAPTURE_TRAFFIC,
     DEFAULT_FINISH_MESSAGE,
     DEFAULT_KEEP_ALIVE_INTERVAL,
+    DEFAULT_KEEP_ALIVE_UPDATES,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    ENDPOINT_READ,
+)
+from .payload import get_section, loads
+
+# Tuning options only exposed in the options flow: keep them when the entry
+# is reconfigured from the user step.
+_PRESERVED_OPTIONS: tuple[str, ...] = (
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_CAPTURE_COMPRESS,
+    CONF_MAX_CONCURRENT_REQUESTS,
 )
 
 
@@ -47,6 +75,9 @@ class CandyBiancaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             keep_alive = user_input.get(
                 CONF_KEEP_ALIVE_INTERVAL, DEFAULT_KEEP_ALIVE_INTERVAL
             )
+            keep_alive_updates = user_input.get(
+                CONF_KEEP_ALIVE_UPDATES, DEFAULT_KEEP_ALIVE_UPDATES
+            )
             finish = user_input.get(CONF_FINISH_NOTIFICATION, False)
             finish_message = (
                 user_input.get(CONF_FINISH_MESSAGE, DEFAULT_FINISH_MESSAGE)
@@ -61,16 +92,23 @@ class CandyBiancaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 self._abort_if_unique_id_configured()
 
-            session = async_get_clientsession(self.hass)
-            url = f"http://{host}/http-read.json?encrypted=2"
+            client = self._get_running_client(host)
             try:
-                async with session.get(url, timeout=5) as resp:
-                    if resp.status != 200:
+                if client is not None:
+                    # Share the read with the running coordinator/keep-alive
+                    data = await client.async_read(ENDPOINT_READ, 5)
+                    if get_section(data, "statusLavatrice") is None:
                         errors["base"] = "cannot_connect"
-                    else:
-                        data = await resp.json(content_type=None)
-                        if "statusLavatrice" not in data:
+                else:
+                    session = async_get_clientsession(self.hass)
+                    url = f"http://{host}/{ENDPOINT_READ}?encrypted=2"
+                    async with session.get(url, timeout=5) as resp:
+                        if resp.status != 200:
                             errors["base"] = "cannot_connect"
+                        else:
+                            data = loads(await resp.read())
+                            if get_section(data, "statusLavatrice") is None:
+                                errors["base"] = "cannot_connect"
             except (ClientError, TimeoutError, ValueError):
                 errors["base"] = "cannot_connect"
 
@@ -94,6 +132,7 @@ class CandyBiancaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 options: dict[str, object] = {
                     CONF_SCAN_INTERVAL: scan,
                     CONF_KEEP_ALIVE_INTERVAL: keep_alive,
+                    CONF_KEEP_ALIVE_UPDATES: keep_alive_updates,
                     CONF_FINISH_NOTIFICATION: finish,
                     CONF_FINISH_MESSAGE: finish_message,
                 }
@@ -102,6 +141,9 @@ class CandyBiancaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 if timer_entity:
                     options[CONF_TIMER_ENTITY] = timer_entity
                 if reconfigure_entry:
+                    for key in _PRESERVED_OPTIONS:
+                        if key in reconfigure_entry.options:
+                            options[key] = reconfigure_entry.options[key]
                     return self.async_update_reload_and_abort(
                         reconfigure_entry,
                         data={CONF_HOST: host},
@@ -137,6 +179,15 @@ class CandyBiancaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if reconfigure_entry
             else DEFAULT_KEEP_ALIVE_INTERVAL
         )
+        current_keep_alive_updates = (
+            user_input.get(CONF_KEEP_ALIVE_UPDATES, DEFAULT_KEEP_ALIVE_UPDATES)
+            if user_input
+            else reconfigure_entry.options.get(
+                CONF_KEEP_ALIVE_UPDATES, DEFAULT_KEEP_ALIVE_UPDATES
+            )
+            if reconfigure_entry
+            else DEFAULT_KEEP_ALIVE_UPDATES
+        )
         current_finish = (
             user_input.get(CONF_FINISH_NOTIFICATION, False)
             if user_input
@@ -178,6 +229,10 @@ class CandyBiancaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_KEEP_ALIVE_INTERVAL,
                     default=current_keep_alive,
                 ): vol.All(int, vol.Range(min=1, max=3600)),
+                vol.Optional(
+                    CONF_KEEP_ALIVE_UPDATES,
+                    default=current_keep_alive_updates,
+                ): bool,
                 vol.Required(
                     CONF_FINISH_NOTIFICATION,
                     default=current_finish,
@@ -206,6 +261,14 @@ class CandyBiancaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    def _get_running_client(self, host: str) -> CandyBiancaClient | None:
+        """Return the client of an already loaded entry for this host."""
+        for entry_data in self.hass.data.get(DOMAIN, {}).values():
+            coordinator = entry_data.get("coordinator")
+            if coordinator is not None and coordinator.host == host:
+                return coordinator.client
+        return None
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: config_entries.ConfigEntry):
@@ -225,6 +288,27 @@ class CandyBiancaOptionsFlow(config_entries.OptionsFlow):
         current_keep_alive = self.config_entry.options.get(
             CONF_KEEP_ALIVE_INTERVAL, DEFAULT_KEEP_ALIVE_INTERVAL
         )
+        current_keep_alive_updates = self.config_entry.options.get(
+            CONF_KEEP_ALIVE_UPDATES, DEFAULT_KEEP_ALIVE_UPDATES
+        )
+        current_adaptive = self.config_entry.options.get(
+            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+        )
+        current_min_scan = self.config_entry.options.get(
+            CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+        )
+        current_max_scan = self.config_entry.options.get(
+            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+        )
+        current_capture = self.config_entry.options.get(
+            CONF_CAPTURE_TRAFFIC, DEFAULT_CAPTURE_TRAFFIC
+        )
+        current_capture_compress = self.config_entry.options.get(
+            CONF_CAPTURE_COMPRESS, DEFAULT_CAPTURE_COMPRESS
+        )
+        current_max_requests = self.config_entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
         current_notification = self.config_entry.options.get(
             CONF_FINISH_NOTIFICATION, False
         )
@@ -257,12 +341,24 @@ class CandyBiancaOptionsFlow(config_entries.OptionsFlow):
                     if not timer_entity.startswith("timer."):
                         errors[CONF_TIMER_ENTITY] = "invalid_entity_id"
 
+            if user_input.get(
+                CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+            ) > user_input.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL):
+                errors[CONF_MAX_SCAN_INTERVAL] = "invalid_interval_range"
+
             if errors:
                 return self.async_show_form(
                     step_id="init",
                     data_schema=self._get_options_schema(
                         current_scan,
                         current_keep_alive,
+                        current_keep_alive_updates,
+                        current_adaptive,
+                        current_min_scan,
+                        current_max_scan,
+                        current_capture,
+                        current_capture_compress,
+                        current_max_requests,
                         current_notification,
                         current_finish_message,
                         current_satellite,
@@ -284,6 +380,13 @@ class CandyBiancaOptionsFlow(config_entries.OptionsFlow):
         data_schema = self._get_options_schema(
             current_scan,
             current_keep_alive,
+            current_keep_alive_updates,
+            current_adaptive,
+            current_min_scan,
+            current_max_scan,
+            current_capture,
+            current_capture_compress,
+            current_max_requests,
             current_notification,
             current_finish_message,
             current_satellite,
@@ -300,6 +403,13 @@ class CandyBiancaOptionsFlow(config_entries.OptionsFlow):
         self,
         current_scan: int,
         current_keep_alive: int,
+        current_keep_alive_updates: bool,
+        current_adaptive: bool,
+        current_min_scan: int,
+        current_max_scan: int,
+        current_capture: bool,
+        current_capture_compress: bool,
+        current_max_requests: int,
         current_notification: bool,
         current_finish_message: str,
         current_satellite: str,
@@ -315,6 +425,34 @@ class CandyBiancaOptionsFlow(config_entries.OptionsFlow):
                     CONF_KEEP_ALIVE_INTERVAL,
                     default=current_keep_alive,
                 ): vol.All(int, vol.Range(min=1, max=3600)),
+                vol.Optional(
+                    CONF_KEEP_ALIVE_UPDATES,
+                    default=current_keep_alive_updates,
+                ): bool,
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING,
+                    default=current_adaptive,
+                ): bool,
+                vol.Optional(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=current_min_scan,
+                ): vol.All(int, vol.Range(min=1, max=3600)),
+                vol.Optional(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=current_max_scan,
+                ): vol.All(int, vol.Range(min=5, max=86400)),
+                vol.Optional(
+                    CONF_CAPTURE_TRAFFIC,
+                    default=current_capture,
+                ): bool,
+                vol.Optional(
+                    CONF_CAPTURE_COMPRESS,
+                    default=current_capture_compress,
+                ): bool,
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_REQUESTS,
+                    default=current_max_requests,
+                ): vol.All(int, vol.Range(min=1, max=64)),
                 vol.Required(
                     CONF_FINISH_NOTIFICATION,
                     default=current_notification,
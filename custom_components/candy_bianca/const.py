@@ -18,12 +18,122 @@ CONF_SATELLITE_ENTITY = "satellite_entity"
 CONF_FINISH_MESSAGE = "finish_message"
 CONF_KEEP_ALIVE_INTERVAL = "keep_alive_interval"
 CONF_TIMER_ENTITY = "timer_entity"
+CONF_KEEP_ALIVE_UPDATES = "keep_alive_updates"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_CAPTURE_TRAFFIC = "capture_traffic"
+CONF_CAPTURE_COMPRESS = "capture_compress"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
 
 DEFAULT_SCAN_INTERVAL = 30  # seconds
 DEFAULT_KEEP_ALIVE_INTERVAL = 1  # seconds
+DEFAULT_KEEP_ALIVE_UPDATES = False
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_MIN_SCAN_INTERVAL = 5  # seconds
+DEFAULT_MAX_SCAN_INTERVAL = 300  # seconds
+DEFAULT_CAPTURE_TRAFFIC = False
+DEFAULT_CAPTURE_COMPRESS = True
 DEFAULT_NAME = "Candy Bianca"
 DEFAULT_FINISH_MESSAGE = "La lavasciuga ha terminato il programma {program_name}"
 
+# Washer HTTP endpoints
+ENDPOINT_READ = "http-read.json"
+ENDPOINT_STATISTICS = "http-getStatistics.json"
+ENDPOINT_WRITE = "http-write.json"
+
+# Per-endpoint request deadlines, the total budget of one coordinator refresh
+# and how long a refresh waits for optional endpoints once the status is in.
+ENDPOINT_TIMEOUTS: dict[str, float] = {
+    ENDPOINT_READ: 10,
+    ENDPOINT_STATISTICS: 10,
+    ENDPOINT_WRITE: 10,
+}
+REFRESH_BUDGET = 12  # seconds
+OPTIONAL_ENDPOINT_GRACE = 1  # seconds
+# TCP connect deadline: an unreachable washer fails fast instead of waiting
+# for the whole request deadline.
+CONNECT_TIMEOUT = 0.8  # seconds
+
+# Circuit breaker: consecutive connection failures before requests stop, and
+# bounds of the exponential backoff between probes.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BACKOFF_BASE = 5  # seconds
+BREAKER_BACKOFF_MAX = 300  # seconds
+
+# Per-washer connection pool: idle connections stay open longer than the
+# keep-alive interval so consecutive requests reuse the same socket.
+CONNECTION_KEEP_ALIVE_TIMEOUT = 15  # seconds
+DNS_CACHE_TTL = 300  # seconds
+# Reads answered from the last response instead of hitting the washer again
+DEFAULT_READ_FRESHNESS = 0.5  # seconds
+
+# Statistics counters: refreshed in the background this often, and retried
+# sooner as long as they were never read.
+STATISTICS_REFRESH_INTERVAL = 6 * 3600  # seconds
+STATISTICS_RETRY_INTERVAL = 60  # seconds
+
+# Diagnostics: requests kept per endpoint for latency percentiles and error
+# rate, and how often the diagnostic sensors refresh their state.
+LATENCY_WINDOW = 200
+DIAGNOSTIC_UPDATE_INTERVAL = 30  # seconds
+# Raw responses and request traces kept in memory for the diagnostics
+# download: at most this many payloads per endpoint, within a fixed byte
+# budget per endpoint.
+PAYLOAD_HISTORY_SIZE = 50
+PAYLOAD_HISTORY_BYTES = 32 * 1024
+TRACE_HISTORY_SIZE = 100
+
+# Confirmation burst after a command: the status is read after each of these
+# delays (seconds) until MachMd shows the command took effect; a command that
+# did not is sent again up to COMMAND_RETRIES times.
+COMMAND_CONFIRM_DELAYS: tuple[float, ...] = (0.5, 0.5, 1, 1, 2, 3)
+COMMAND_CONFIRM_TIMEOUT = 3  # seconds, per confirmation read
+COMMAND_RETRIES = 1
+# Start/stop services targeting several washers: how many are commanded at
+# once and how long each may take, confirmation included.
+DEFAULT_FLEET_CONCURRENCY = 4
+DEFAULT_FLEET_TIMEOUT = 30  # seconds
+
+# Traffic capture (opt-in): responses are written in batches, the file is
+# rotated past the size cap keeping a few older files.
+CAPTURE_MAX_BYTES = 5 * 1024 * 1024
+CAPTURE_BACKUPS = 3
+CAPTURE_FLUSH_INTERVAL = 10  # seconds
+CAPTURE_BATCH_SIZE = 100
+
+# Key of the scheduler shared by every config entry in hass.data
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+# Dispatcher signal sent when the pending panel options of a washer (host)
+# are cleared
+SIGNAL_PENDING_OPTIONS_CLEARED = f"{DOMAIN}_pending_options_cleared_{{}}"
+# Key of the service target index shared by every config entry
+DATA_TARGET_INDEX = f"{DOMAIN}_target_index"
+# Set in hass.data while a profile service call is running
+DATA_PROFILER = f"{DOMAIN}_profiler"
+# Functions of the integration listed in a profile service response
+PROFILE_TOP_FUNCTIONS = 40
+DEFAULT_PROFILE_DURATION = 60  # seconds
+# The whole event loop is profiled, not only this integration: keep it short
+MAX_PROFILE_DURATION = 600  # seconds
+
+# Scheduler shared by all washers: random shift applied to each slot, as a
+# fraction of the interval, and how many reads are on the wire at once across
+# all washers unless the options set another limit.
+SCHEDULER_JITTER = 0.05
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Adaptive polling: refresh interval (seconds) per machine mode (MachMd).
+# Modes not listed (standby/stopped) poll at the configured maximum, the last
+# minutes of a cycle poll at the configured minimum.
+ADAPTIVE_MODE_INTERVALS: dict[int, int] = {
+    2: 10,  # washing
+    4: 30,  # paused
+    5: 120,  # delayed start
+    7: 60,  # finished
+}
+ADAPTIVE_NEAR_END_SECONDS = 300
+
 TEMPERATURE_OPTIONS: list[int] = [0, 20, 30, 40, 60, 90]
 SPIN_OPTIONS: list[int] = list(range(0, 11))
 
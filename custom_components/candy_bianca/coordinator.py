@@ -1,16 +1,55 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
 from asyncio import TimeoutError
+from datetime import datetime
+from time import monotonic
+from typing import Any
 
 from aiohttp import ClientError
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
-from .const import CONF_HOST, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+from .breaker import CircuitOpenError
+from .capture import TrafficCapture, capture_path
+from .client import PRIORITY_BACKGROUND, CandyBiancaClient
+from .commands import CommandResult, expected_status
+from .const import (
+    ADAPTIVE_MODE_INTERVALS,
+    ADAPTIVE_NEAR_END_SECONDS,
+    COMMAND_CONFIRM_DELAYS,
+    COMMAND_CONFIRM_TIMEOUT,
+    COMMAND_RETRIES,
+    CONF_ADAPTIVE_POLLING,
+    CONF_CAPTURE_COMPRESS,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_HOST,
+    CONF_KEEP_ALIVE_UPDATES,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_CAPTURE_COMPRESS,
+    DEFAULT_CAPTURE_TRAFFIC,
+    DEFAULT_KEEP_ALIVE_UPDATES,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    ENDPOINT_READ,
+    ENDPOINT_STATISTICS,
+    ENDPOINT_TIMEOUTS,
+    ENDPOINT_WRITE,
+    OPTIONAL_ENDPOINT_GRACE,
+    REFRESH_BUDGET,
+    STATISTICS_RETRY_INTERVAL,
+)
+from .metrics import RequestMetrics
+from .payload import get_section
+from .status import EMPTY_STATUS, WasherStatus
+from .util import safe_int
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,54 +60,426 @@ class CandyBiancaCoordinator(DataUpdateCoordinator[dict]):
     def __init__(self, hass: HomeAssistant, entry) -> None:
         self.host: str = entry.data[CONF_HOST]
         scan = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self.keep_alive_updates: bool = bool(
+            entry.options.get(CONF_KEEP_ALIVE_UPDATES, DEFAULT_KEEP_ALIVE_UPDATES)
+        )
+        self._adaptive_polling: bool = bool(
+            entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        )
+        self._min_interval: int = entry.options.get(
+            CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+        )
+        self._max_interval: int = entry.options.get(
+            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+        )
+
+        # Polls are driven by the shared scheduler, which reads this value
+        # before booking each slot. When the keep-alive pushes its responses
+        # there is no need for a separate scheduled poll: the first refresh
+        # and manual refreshes still go through _async_update_data.
+        self.poll_interval: float | None = (
+            None if self.keep_alive_updates else float(scan)
+        )
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"Candy Bianca ({self.host})",
-            update_interval=timedelta(seconds=scan),
+            update_interval=None,
         )
-        self._session = async_get_clientsession(hass)
+        # Status keys that differ from the snapshot listeners last saw;
+        # None means "everything" (first update or availability change).
+        self.changed_keys: frozenset[str] | None = None
+        self._notified_data: dict | None = None
+        self._notified_success: bool | None = None
+        self._status: WasherStatus = EMPTY_STATUS
+        self._status_source: dict | None = None
+        self.client = CandyBiancaClient(self.host)
+        self.capture: TrafficCapture | None = None
+        if entry.options.get(CONF_CAPTURE_TRAFFIC, DEFAULT_CAPTURE_TRAFFIC):
+            compress = entry.options.get(
+                CONF_CAPTURE_COMPRESS, DEFAULT_CAPTURE_COMPRESS
+            )
+            self.capture = TrafficCapture(
+                hass, capture_path(hass, self.host, compress)
+            )
+            self.client.on_response = self.capture.record
+        self._statistics: dict | None = None
+        self._statistics_mode: int | None = None
+        self._statistics_attempt = -STATISTICS_RETRY_INTERVAL
+        # Errors are swallowed to keep the last known state: track how fresh
+        # that state really is.
+        self.last_success: datetime | None = None
+        self.consecutive_failures = 0
+        # Time from sending a command to reading a status that reflects it;
+        # commands never confirmed count as errors.
+        self.command_metrics = RequestMetrics()
+        # Mode of the last status the washer actually returned
+        self.reported_mode: int | None = None
+        # Fields expected from a command being confirmed, shown before the
+        # washer reports them, and the modes that confirm the command.
+        self._optimistic: tuple[dict[str, str], frozenset[int]] | None = None
+        self._reported: dict = {}
+        self.optimistic_rollbacks = 0
 
     async def _async_update_data(self) -> dict:
-        url = f"http://{self.host}/http-read.json?encrypted=2"
+        # Endpoints are requested together (the client pipelines them on the
+        # single washer connection); only the status read may use the whole
+        # refresh budget, optional endpoints get a short grace period and are
+        # otherwise published later, meanwhile their cached value is used.
+        deadline = monotonic() + REFRESH_BUDGET
+        statistics_task: asyncio.Task | None = None
+        if self._statistics is None and self._statistics_retry_due():
+            statistics_task = self._async_start_statistics()
+
         try:
-            async with self._session.get(url, timeout=10) as resp:
-                resp.raise_for_status()
-                data = await resp.json(content_type=None)
+            async with asyncio.timeout(deadline - monotonic()):
+                data = await self.client.async_read(
+                    ENDPOINT_READ, ENDPOINT_TIMEOUTS[ENDPOINT_READ]
+                )
+        except CircuitOpenError as err:
+            _LOGGER.debug("Skipping Candy Bianca update: %s", err)
+            self.record_failure()
+            return self.data or {}
         except (ClientError, TimeoutError, ValueError) as err:
             _LOGGER.warning(
                 "Error updating Candy Bianca %s: %s — keeping last known state",
                 self.host,
                 err,
             )
+            self.record_failure()
             return self.data or {}
 
-        status = data.get("statusLavatrice", {})
-        if not isinstance(status, dict):
-            _LOGGER.warning(
-                "Unexpected response from Candy Bianca %s: %s", self.host, data
-            )
+        status = self._parse_status(data)
+        if status is None:
+            self.record_failure()
             return {}
+        self._record_success(status)
+
+        if self._statistics_due(status) and statistics_task is None:
+            statistics_task = self._async_start_statistics()
+        if statistics_task is not None:
+            grace = min(OPTIONAL_ENDPOINT_GRACE, deadline - monotonic())
+            done, _ = await asyncio.wait({statistics_task}, timeout=max(grace, 0))
+            if not done:
+                _LOGGER.debug(
+                    "Candy Bianca %s: statistics late, publishing cached values",
+                    self.host,
+                )
+                statistics_task.add_done_callback(self._async_publish_late_statistics)
+        if self._statistics is not None:
+            status["statistics"] = self._statistics
+
+        self._async_adapt_update_interval(status)
+        return self._with_optimistic(status)
 
-        statistics_url = f"http://{self.host}/http-getStatistics.json?encrypted=2"
+    def _statistics_due(self, status: dict) -> bool:
+        """Tell whether the usage counters may have changed.
+
+        They only move when a cycle ends, so they are read at startup and
+        after a transition to Finished; a slow background job catches
+        anything else (e.g. a cycle run while Home Assistant was down).
+        """
+        mode = safe_int(status.get("MachMd"))
+        previous_mode = self._statistics_mode
+        self._statistics_mode = mode
+        if self._statistics is None:
+            return self._statistics_retry_due()
+        return mode == 7 and previous_mode not in (None, 7)
+
+    def _statistics_retry_due(self) -> bool:
+        # Counters not read yet (or the first read failed): retry, but not on
+        # every keep-alive of a washer that does not answer.
+        return monotonic() - self._statistics_attempt >= STATISTICS_RETRY_INTERVAL
+
+    def _async_start_statistics(self) -> asyncio.Task:
+        return self.hass.async_create_task(self._async_fetch_statistics())
+
+    @callback
+    def _async_publish_late_statistics(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() or not task.result() or not self.data:
+            return
+        self.async_set_updated_data({**self.data, "statistics": self._statistics})
+
+    async def _async_fetch_statistics(self) -> bool:
+        """Read the usage counters; return True when they changed."""
+        self._statistics_attempt = monotonic()
         try:
-            async with self._session.get(statistics_url, timeout=10) as resp:
-                resp.raise_for_status()
-                statistics_response = await resp.json(content_type=None)
+            statistics_response = await self.client.async_read(
+                ENDPOINT_STATISTICS,
+                ENDPOINT_TIMEOUTS[ENDPOINT_STATISTICS],
+                PRIORITY_BACKGROUND,
+            )
         except (ClientError, TimeoutError, ValueError) as err:
             _LOGGER.debug(
                 "Error updating Candy Bianca statistics %s: %s", self.host, err
             )
+            return False
+
+        return self._store_statistics(statistics_response)
+
+    def _store_statistics(self, data: Any) -> bool:
+        """Keep the counters of a statistics payload; True when they changed."""
+        counters = get_section(data, "statusCounters")
+        if counters is None:
+            _LOGGER.debug(
+                "Unexpected statistics response from Candy Bianca %s: %s",
+                self.host,
+                data,
+            )
+            return False
+
+        if counters == self._statistics:
+            return False
+        self._statistics = counters
+        return True
+
+    @callback
+    def async_handle_statistics(self, data: Any) -> None:
+        """Publish a statistics payload read outside of a refresh."""
+        if self._store_statistics(data) and self.data:
+            self.async_set_updated_data({**self.data, "statistics": self._statistics})
+
+    async def async_refresh_statistics(self) -> None:
+        """Fetch the usage counters and publish them with the current status."""
+        if await self._async_fetch_statistics() and self.data:
+            self.async_set_updated_data({**self.data, "statistics": self._statistics})
+
+    @callback
+    def _async_adapt_update_interval(self, status: dict) -> None:
+        """Pick the next refresh interval from the reported machine state."""
+        if not self._adaptive_polling or self.poll_interval is None:
+            return
+
+        seconds = compute_adaptive_interval(
+            status, self._min_interval, self._max_interval
+        )
+        if self.poll_interval != seconds:
+            _LOGGER.debug(
+                "Candy Bianca %s: refresh interval set to %ss", self.host, seconds
+            )
+            self.poll_interval = float(seconds)
+
+    async def async_shutdown(self) -> None:
+        """Cancel refreshes and close the washer connection pool."""
+        await super().async_shutdown()
+        await self.client.async_close()
+        if self.capture is not None:
+            await self.capture.async_close()
+
+    @property
+    def status(self) -> WasherStatus:
+        """Return the decoded snapshot of the current data.
+
+        Decoding happens once per new data object, however many entities
+        read it.
+        """
+        data = self.data
+        if data is not self._status_source:
+            self._status = WasherStatus.from_dict(data) if data else EMPTY_STATUS
+            self._status_source = data
+        return self._status
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners only when the status actually changed."""
+        data = self.data or {}
+        if (
+            self._notified_data is None
+            or self._notified_success != self.last_update_success
+        ):
+            self.changed_keys = None
         else:
-            counters = statistics_response.get("statusCounters")
-            if isinstance(counters, dict):
-                status["statistics"] = counters
-            else:
+            changed = diff_status(self._notified_data, data)
+            if not changed:
+                return
+            self.changed_keys = changed
+
+        self._notified_data = data
+        self._notified_success = self.last_update_success
+        super().async_update_listeners()
+
+    @callback
+    def async_handle_keep_alive(
+        self, data: Any, *, refresh_statistics: bool = True
+    ) -> None:
+        """Publish a status payload received by the keep-alive loop.
+
+        With `refresh_statistics` unset the usage counters are never fetched,
+        so replayed payloads do not cause requests to the washer.
+        """
+        status = self._parse_status(data)
+        if status is None:
+            self.record_failure()
+            return
+        self._record_success(status)
+
+        if refresh_statistics and self._statistics_due(status):
+            self.hass.async_create_task(self.async_refresh_statistics())
+        # The keep-alive only reads the status endpoint: merge the cached
+        # counters.
+        if self._statistics is not None:
+            status["statistics"] = self._statistics
+        status = self._with_optimistic(status)
+
+        previous = self.data or {}
+        if status == previous:
+            return
+
+        self.async_set_updated_data(status)
+
+    async def async_send_command(
+        self, params: str, expected_modes: frozenset[int]
+    ) -> CommandResult:
+        """Send a command and read the status until it took effect.
+
+        A short burst of status reads follows the write and stops as soon as
+        MachMd is one of `expected_modes`; each read is published to the
+        listeners. A command that had no visible effect is sent again.
+        Write errors are raised to the caller.
+
+        Once the washer accepted the command, the fields it should change
+        are published straight away and kept over the status reads until
+        one confirms the command; if none does, they are rolled back.
+        """
+        started = monotonic()
+        queue_wait = 0.0
+        optimistic = None
+        try:
+            for attempt in range(1, COMMAND_RETRIES + 2):
+                queue_wait = await self.client.async_write(
+                    params, ENDPOINT_TIMEOUTS[ENDPOINT_WRITE]
+                )
+                if attempt == 1:
+                    optimistic = self._async_set_optimistic(
+                        expected_status(params), expected_modes
+                    )
+                if await self._async_confirm(expected_modes):
+                    latency = monotonic() - started
+                    self.command_metrics.record(latency, True)
+                    _LOGGER.debug(
+                        "Candy Bianca %s command confirmed after %.2fs",
+                        self.host,
+                        latency,
+                    )
+                    return CommandResult(queue_wait, latency, attempt)
                 _LOGGER.debug(
-                    "Unexpected statistics response from Candy Bianca %s: %s",
+                    "Candy Bianca %s: command not reflected by the status (attempt %s)",
                     self.host,
-                    statistics_response,
+                    attempt,
+                )
+        finally:
+            # Unless a later command replaced it
+            if optimistic is not None and self._optimistic is optimistic:
+                self._async_rollback_optimistic()
+        self.command_metrics.record(monotonic() - started, False)
+        return CommandResult(queue_wait, None, COMMAND_RETRIES + 1)
+
+    async def _async_confirm(self, expected_modes: frozenset[int]) -> bool:
+        for delay in COMMAND_CONFIRM_DELAYS:
+            await asyncio.sleep(delay)
+            try:
+                data = await self.client.async_read(
+                    ENDPOINT_READ, COMMAND_CONFIRM_TIMEOUT
                 )
+            except CircuitOpenError:
+                return False
+            except (ClientError, TimeoutError, ValueError) as err:
+                _LOGGER.debug(
+                    "Candy Bianca %s confirmation read failed: %s", self.host, err
+                )
+                self.record_failure()
+                continue
+            self.async_handle_keep_alive(data)
+            if self.reported_mode in expected_modes:
+                return True
+        return False
+
+    @callback
+    def _async_set_optimistic(
+        self, fields: dict[str, str], expected_modes: frozenset[int]
+    ) -> tuple[dict[str, str], frozenset[int]] | None:
+        if not fields or not self.data:
+            return None
+        if self._optimistic is None:
+            self._reported = self.data
+        self._optimistic = (fields, expected_modes)
+        self.async_set_updated_data({**self._reported, **fields})
+        return self._optimistic
+
+    @callback
+    def _async_rollback_optimistic(self) -> None:
+        self._optimistic = None
+        self.optimistic_rollbacks += 1
+        _LOGGER.debug(
+            "Candy Bianca %s: command not confirmed, restoring the reported state",
+            self.host,
+        )
+        if self._reported:
+            self.async_set_updated_data(self._reported)
+
+    def _with_optimistic(self, status: dict) -> dict:
+        """Overlay the fields of a command the washer has not reflected yet."""
+        if self._optimistic is None:
+            return status
+        self._reported = status
+        fields, expected_modes = self._optimistic
+        if self.reported_mode in expected_modes:
+            self._optimistic = None
+            return status
+        return {**status, **fields}
+
+    @property
+    def data_age(self) -> float | None:
+        """Seconds since the washer last returned a valid status."""
+        if self.last_success is None:
+            return None
+        return (dt_util.utcnow() - self.last_success).total_seconds()
+
+    def _record_success(self, status: dict) -> None:
+        self.last_success = dt_util.utcnow()
+        self.consecutive_failures = 0
+        self.reported_mode = safe_int(status.get("MachMd"))
+
+    @callback
+    def record_failure(self) -> None:
+        """Count a status read that did not produce fresh data."""
+        self.consecutive_failures += 1
+
+    def _parse_status(self, data: Any) -> dict | None:
+        """Extract the status dict from a http-read.json payload."""
+        status = get_section(data, "statusLavatrice")
+        if status is None:
+            _LOGGER.warning(
+                "Unexpected response from Candy Bianca %s: %s", self.host, data
+            )
+            return None
+        # The decoded payload is shared by every reader of the client
+        return dict(status)
+
+
+def compute_adaptive_interval(
+    status: dict, min_interval: int, max_interval: int
+) -> int:
+    """Return the refresh interval (seconds) suited to the washer state."""
+    mode = safe_int(status.get("MachMd"))
+    remaining = safe_int(status.get("RemTime"))
+
+    if mode == 2 and 0 <= remaining <= ADAPTIVE_NEAR_END_SECONDS:
+        seconds = min_interval
+    else:
+        seconds = ADAPTIVE_MODE_INTERVALS.get(mode, max_interval)
+
+    return max(min_interval, min(seconds, max_interval))
+
 
-        return status
+def diff_status(old: dict, new: dict) -> frozenset[str]:
+    """Return the keys whose value differs between two status snapshots."""
+    if old is new:
+        return frozenset()
+    missing = object()
+    return frozenset(
+        key
+        for key in old.keys() | new.keys()
+        if old.get(key, missing) != new.get(key, missing)
+    )
@@ -0,0 +1,117 @@
+"""Diagnostics support for Candy Bianca."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_KEEP_ALIVE_INTERVAL,
+    DATA_SCHEDULER,
+    DEFAULT_KEEP_ALIVE_INTERVAL,
+    DOMAIN,
+)
+from .coordinator import CandyBiancaCoordinator
+
+TO_REDACT = {CONF_HOST, "title", "unique_id"}
+
+
+def _timestamp(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+    }
+
+    coordinator: CandyBiancaCoordinator | None = entry_data.get("coordinator")
+    if coordinator is None:
+        return diagnostics
+
+    client = coordinator.client
+    diagnostics["coordinator"] = {
+        "poll_interval": coordinator.poll_interval,
+        "keep_alive_updates": coordinator.keep_alive_updates,
+        "last_update_success": coordinator.last_update_success,
+        "last_success": coordinator.last_success,
+        "data_age": coordinator.data_age,
+        "consecutive_failures": coordinator.consecutive_failures,
+        "command_latency": {
+            **coordinator.command_metrics.percentiles(),
+            "commands": coordinator.command_metrics.requests,
+            "unconfirmed": coordinator.command_metrics.errors,
+        },
+        "reported_mode": coordinator.reported_mode,
+        "optimistic_rollbacks": coordinator.optimistic_rollbacks,
+        "changed_keys": sorted(coordinator.changed_keys or ()),
+        "data": coordinator.data,
+    }
+    diagnostics["keep_alive"] = {
+        "interval": entry.options.get(
+            CONF_KEEP_ALIVE_INTERVAL, DEFAULT_KEEP_ALIVE_INTERVAL
+        ),
+        "scheduled": entry_data.get("keep_alive_unsub") is not None,
+    }
+
+    # Only the jobs of this washer; their names start with the host
+    if scheduler := hass.data.get(DATA_SCHEDULER):
+        scheduler_state = scheduler.as_dict()
+        prefix = f"{coordinator.host} "
+        scheduler_state["jobs"] = {
+            name.removeprefix(prefix): job
+            for name, job in scheduler_state["jobs"].items()
+            if name.startswith(prefix)
+        }
+        scheduler_state["total_jobs"] = scheduler.job_count
+        diagnostics["scheduler"] = scheduler_state
+
+    diagnostics["managers"] = {
+        key: manager.as_dict()
+        for key in ("notification_manager", "timer_manager")
+        if (manager := entry_data.get(key)) is not None
+    }
+
+    diagnostics["client"] = {
+        "connection": client.connection_stats,
+        "latency": {
+            kind: {
+                **metrics.percentiles(),
+                "requests": metrics.requests,
+                "errors": metrics.errors,
+            }
+            for kind, metrics in client.metrics.items()
+        },
+        "error_rate": client.error_rate,
+        "traces": [
+            {
+                "time": _timestamp(epoch),
+                "kind": kind,
+                "queue_wait": round(wait, 4),
+                "duration": round(duration, 4),
+                "outcome": outcome,
+            }
+            for epoch, kind, wait, duration, outcome in client.traces
+        ],
+    }
+    diagnostics["payloads"] = {
+        "bytes": client.payloads.size,
+        "history": [
+            {
+                "received": _timestamp(payload.received),
+                "endpoint": payload.endpoint,
+                "duration": round(payload.duration, 4),
+                "body": payload.body.decode("utf-8", errors="replace"),
+            }
+            for payload in client.payloads
+        ],
+    }
+    return diagnostics
@@ -0,0 +1,65 @@
+"""Rolling request latency and error statistics."""
+from __future__ import annotations
+
+from collections import deque
+from math import ceil
+
+from .const import LATENCY_WINDOW
+
+# Kinds of request tracked by the client
+KIND_READ = "read"
+KIND_STATISTICS = "statistics"
+KIND_WRITE = "write"
+KIND_KEEP_ALIVE = "keep_alive"
+REQUEST_KINDS = (KIND_READ, KIND_STATISTICS, KIND_WRITE, KIND_KEEP_ALIVE)
+
+
+class RequestMetrics:
+    """Latency samples and outcomes of the last requests of one kind.
+
+    Recording only appends to bounded deques; percentiles are computed when
+    read, which happens far less often than requests are made.
+    """
+
+    __slots__ = ("requests", "errors", "_latencies", "_outcomes")
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.requests = 0
+        self.errors = 0
+        # Seconds, successful requests only
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._outcomes: deque[bool] = deque(maxlen=window)
+
+    def record(self, duration: float, ok: bool) -> None:
+        """Record one request that reached the washer (or failed to)."""
+        self.requests += 1
+        self._outcomes.append(ok)
+        if ok:
+            self._latencies.append(duration)
+        else:
+            self.errors += 1
+
+    @property
+    def samples(self) -> int:
+        return len(self._outcomes)
+
+    @property
+    def window_errors(self) -> int:
+        return self._outcomes.count(False)
+
+    def percentiles(self) -> dict[str, float | None]:
+        """Return the p50/p95/p99 latency in milliseconds (nearest rank)."""
+        ordered = sorted(self._latencies)
+        if not ordered:
+            return {"p50": None, "p95": None, "p99": None}
+        return {
+            name: round(ordered[max(0, ceil(q * len(ordered)) - 1)] * 1000, 1)
+            for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        }
+
+    @property
+    def error_rate(self) -> float | None:
+        """Fraction of failed requests in the window, None without samples."""
+        if not self._outcomes:
+            return None
+        return self.window_errors / len(self._outcomes)
@@ -13,8 +13,6 @@ from .const import (
     CONF_SATELLITE_ENTITY,
     DEFAULT_FINISH_MESSAGE,
 )
-from .programs import get_program_name
-from .util import safe_int
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,19 +27,28 @@ class FinishNotificationManager:
         self._unsubscribe: Callable[[], None] | None = coordinator.async_add_listener(
             self._handle_coordinator_update
         )
-        self._last_mode: int | None = safe_int((coordinator.data or {}).get("MachMd"))
+        self._last_mode: int | None = coordinator.status.mode
         self._last_program_name: str | None = None
 
+    def as_dict(self) -> dict[str, Any]:
+        """Return the manager state, for diagnostics."""
+        return {
+            "enabled": bool(self._options.get(CONF_FINISH_NOTIFICATION)),
+            "satellite": self._options.get(CONF_SATELLITE_ENTITY),
+            "last_mode": self._last_mode,
+            "last_program_name": self._last_program_name,
+        }
+
     def _handle_coordinator_update(self) -> None:
         enabled = bool(self._options.get(CONF_FINISH_NOTIFICATION))
         satellite = self._options.get(CONF_SATELLITE_ENTITY)
-        data: dict[str, Any] = self._coordinator.data or {}
+        status = self._coordinator.status
 
-        current_mode = safe_int(data.get("MachMd"))
+        current_mode = status.mode
         previous_mode = self._last_mode
         self._last_mode = current_mode
 
-        program_name = get_program_name(data)
+        program_name = status.program_name
         if program_name != "Other":
             self._last_program_name = program_name
         elif current_mode in (-1, 0):
@@ -0,0 +1,105 @@
+"""Decode washer responses straight from the raw body bytes."""
+from __future__ import annotations
+
+import json
+from collections import deque
+from time import time
+from typing import Any, NamedTuple
+
+from .const import PAYLOAD_HISTORY_BYTES, PAYLOAD_HISTORY_SIZE
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+
+def _stdlib_loads(body: bytes) -> Any:
+    # The washer firmware does not always send clean UTF-8
+    return json.loads(body.decode("utf-8", errors="replace"))
+
+
+def loads(body: bytes) -> Any:
+    """Parse a JSON body, with orjson when available.
+
+    Raise ValueError on malformed payloads, whichever backend is used.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # orjson rejects invalid UTF-8 that the lenient path accepts
+            pass
+    return _stdlib_loads(body)
+
+
+def get_section(payload: Any, section: str) -> dict[str, Any] | None:
+    """Return the `section` object of a decoded response, or None.
+
+    Only the part of the payload the integration consumes is checked: the
+    section must be a JSON object, its fields are coerced by the readers.
+    """
+    if not isinstance(payload, dict):
+        return None
+    value = payload.get(section)
+    return value if isinstance(value, dict) else None
+
+
+class RawPayload(NamedTuple):
+    """A response body as received, for the diagnostics download."""
+
+    received: float  # epoch seconds
+    endpoint: str
+    duration: float  # seconds
+    body: bytes
+
+
+class PayloadHistory:
+    """Ring buffers of the last raw responses of one washer, per endpoint.
+
+    Bodies are kept as the bytes read from the socket (no re-serialization).
+    Each endpoint has its own ring, so frequent status reads cannot evict the
+    rare statistics response; the oldest bodies of an endpoint are dropped
+    once either its count or its byte budget is exceeded, so memory per
+    washer stays bounded.
+    """
+
+    __slots__ = ("_rings", "_sizes", "_max_entries", "_max_bytes", "size")
+
+    def __init__(
+        self,
+        max_entries: int = PAYLOAD_HISTORY_SIZE,
+        max_bytes: int = PAYLOAD_HISTORY_BYTES,
+    ) -> None:
+        self._rings: dict[str, deque[RawPayload]] = {}
+        self._sizes: dict[str, int] = {}
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self.size = 0  # bytes, all endpoints
+
+    def add(self, endpoint: str, duration: float, body: bytes) -> None:
+        """Record a response body (truncated to the byte budget)."""
+        body = body[: self._max_bytes]
+        ring = self._rings.get(endpoint)
+        if ring is None:
+            ring = self._rings[endpoint] = deque()
+        ring.append(RawPayload(time(), endpoint, duration, body))
+        size = self._sizes.get(endpoint, 0) + len(body)
+        self.size += len(body)
+        while size > self._max_bytes or len(ring) > self._max_entries:
+            dropped = len(ring.popleft().body)
+            size -= dropped
+            self.size -= dropped
+        self._sizes[endpoint] = size
+
+    def __len__(self) -> int:
+        return sum(len(ring) for ring in self._rings.values())
+
+    def __iter__(self):
+        """Iterate over the responses of every endpoint, oldest first."""
+        return iter(
+            sorted(
+                (payload for ring in self._rings.values() for payload in ring),
+                key=lambda payload: payload.received,
+            )
+        )
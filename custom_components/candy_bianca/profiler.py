@@ -0,0 +1,75 @@
+"""On-demand profiling of the integration's code paths."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import pstats
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_PROFILER, DOMAIN, PROFILE_TOP_FUNCTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+_PACKAGE_DIR = str(Path(__file__).parent)
+
+
+async def async_profile(hass: HomeAssistant, duration: float) -> dict[str, Any]:
+    """Profile the whole event loop thread for `duration` seconds.
+
+    Everything this integration runs on the loop (coordinator refreshes,
+    HTTP client, listeners, entity properties) is captured without wrapping
+    anything, so nothing is added to those paths outside the window. The
+    rest of Home Assistant is profiled too and runs slower meanwhile, hence
+    the service caps `duration` at MAX_PROFILE_DURATION. The
+    complete stats are written to a pstats file in the config directory
+    (readable by snakeviz, flameprof, ...); the returned report only lists
+    the functions of this integration.
+    """
+    if hass.data.get(DATA_PROFILER):
+        raise HomeAssistantError("A Candy Bianca profile is already running")
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as err:
+        # Another profiler (e.g. the profiler integration) is active
+        raise HomeAssistantError(f"Unable to start profiling: {err}") from err
+    hass.data[DATA_PROFILER] = True
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        profiler.disable()
+        hass.data.pop(DATA_PROFILER, None)
+
+    stamp = dt_util.utcnow().strftime("%Y%m%d_%H%M%S")
+    path = Path(hass.config.path(f"{DOMAIN}_profile_{stamp}.prof"))
+    functions = await hass.async_add_executor_job(_write_profile, profiler, path)
+    _LOGGER.info("Candy Bianca profile written to %s", path)
+    return {"file": str(path), "duration": duration, "functions": functions}
+
+
+def _write_profile(profiler: cProfile.Profile, path: Path) -> list[dict[str, Any]]:
+    profiler.dump_stats(path)
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+
+    functions = []
+    for (filename, line, name), values in stats.items():
+        if not filename.startswith(_PACKAGE_DIR):
+            continue
+        _primitive_calls, calls, own, cumulative, _callers = values
+        functions.append(
+            {
+                "function": f"{Path(filename).name}:{line}({name})",
+                "calls": calls,
+                "own_time": round(own, 6),
+                "cumulative_time": round(cumulative, 6),
+            }
+        )
+    functions.sort(key=lambda function: function["cumulative_time"], reverse=True)
+    return functions[:PROFILE_TOP_FUNCTIONS]
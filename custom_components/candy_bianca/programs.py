@@ -1,7 +1,8 @@
 """Helpers to detect the human readable program name."""
 from __future__ import annotations
 
-from typing import Any, Mapping, NamedTuple
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, NamedTuple
 
 
 class ProgramMapping(NamedTuple):
@@ -46,25 +47,87 @@ def get_program_short_name(status: Mapping[str, Any]) -> str:
     return mapping.short_name if mapping else "Other"
 
 
+def match_program(status: Mapping[str, Any]) -> ProgramMapping | None:
+    """Return the program mapping matching the raw status, if any."""
+    return _match_program(status)
+
+
 def _match_program(status: Mapping[str, Any]) -> ProgramMapping | None:
     """Return the matching program mapping for the given status."""
     try:
-        code = int(status.get("PrCode", -1))
-        pr = int(status.get("Pr", -1))
-        lvl = status.get("SLevel")
-        dry = status.get("DryT")
-        lvl_val = int(lvl) if lvl is not None else None
-        dry_val = int(dry) if dry is not None else None
-    except (TypeError, ValueError):
+        return _match_raw(
+            status.get("PrCode", -1),
+            status.get("Pr", -1),
+            status.get("SLevel"),
+            status.get("DryT"),
+        )
+    except TypeError:
+        # Unhashable raw values cannot be memoized nor converted
         return None
 
-    for mapping in PROGRAM_MAPPINGS:
-        if mapping.code != code or mapping.pr != pr:
-            continue
-        if mapping.lvl is not None and mapping.lvl != lvl_val:
-            continue
-        if mapping.dry is not None and mapping.dry != dry_val:
-            continue
-        return mapping
 
-    return None
+class ProgramIndex:
+    """Precompiled lookup from (PrCode, Pr) to their candidate mappings.
+
+    Candidates sharing the same codes are ordered from the most specific
+    (both soil level and dry mode fixed) to the least specific, so a lookup
+    only scans the handful of variants of one program.
+    """
+
+    __slots__ = ("_candidates",)
+
+    def __init__(self, mappings: Iterable[ProgramMapping]) -> None:
+        grouped: dict[tuple[int, int], list[ProgramMapping]] = {}
+        for mapping in mappings:
+            grouped.setdefault((mapping.code, mapping.pr), []).append(mapping)
+        self._candidates: dict[tuple[int, int], tuple[ProgramMapping, ...]] = {
+            key: tuple(sorted(group, key=_wildcard_count))
+            for key, group in grouped.items()
+        }
+
+    def lookup(
+        self, code: int, pr: int, lvl: int | None, dry: int | None
+    ) -> ProgramMapping | None:
+        """Return the most specific mapping for already coerced values."""
+        for mapping in self._candidates.get((code, pr), ()):
+            if mapping.lvl is not None and mapping.lvl != lvl:
+                continue
+            if mapping.dry is not None and mapping.dry != dry:
+                continue
+            return mapping
+        return None
+
+    def match(self, status: Mapping[str, Any]) -> ProgramMapping | None:
+        """Return the mapping for a raw status dict (not memoized)."""
+        return self.match_values(
+            status.get("PrCode", -1),
+            status.get("Pr", -1),
+            status.get("SLevel"),
+            status.get("DryT"),
+        )
+
+    def match_values(
+        self, code: Any, pr: Any, lvl: Any, dry: Any
+    ) -> ProgramMapping | None:
+        """Coerce raw PrCode/Pr/SLevel/DryT values and look them up."""
+        try:
+            code_val = int(code)
+            pr_val = int(pr)
+            lvl_val = int(lvl) if lvl is not None else None
+            dry_val = int(dry) if dry is not None else None
+        except (TypeError, ValueError):
+            return None
+        return self.lookup(code_val, pr_val, lvl_val, dry_val)
+
+
+def _wildcard_count(mapping: ProgramMapping) -> int:
+    return (mapping.lvl is None) + (mapping.dry is None)
+
+
+PROGRAM_INDEX = ProgramIndex(PROGRAM_MAPPINGS)
+
+
+@lru_cache(maxsize=128)
+def _match_raw(code: Any, pr: Any, lvl: Any, dry: Any) -> ProgramMapping | None:
+    """Match raw field values; memoized since a washer repeats them all cycle."""
+    return PROGRAM_INDEX.match_values(code, pr, lvl, dry)
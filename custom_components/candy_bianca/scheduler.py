@@ -0,0 +1,199 @@
+"""Shared scheduler for the polls and keep-alive pings of every washer."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_SCHEDULER, DEFAULT_MAX_CONCURRENT_REQUESTS, SCHEDULER_JITTER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Golden ratio conjugate: consecutive multiples modulo 1 are spread evenly
+# over [0, 1) however many jobs are registered, so adding a washer never
+# requires shuffling the slots of the others.
+_PHASE_STEP = (math.sqrt(5) - 1) / 2
+
+
+@dataclass
+class _ScheduledJob:
+    """A periodic job owned by the scheduler."""
+
+    name: str
+    action: Callable[[], Awaitable[None]]
+    interval: Callable[[], float | None]
+    phase: float
+    handle: asyncio.TimerHandle | None = None
+    scheduled_interval: float | None = None
+    running: bool = False
+    skipped: int = 0
+
+
+class CandyBiancaScheduler:
+    """Stagger periodic washer jobs and cap the reads on the wire at once.
+
+    The cap applies to the HTTP requests themselves, not to whole jobs: a
+    refresh waiting on a slow washer holds no slot while it waits for its
+    deadline, so it cannot starve the other washers. Clients take a slot
+    for every read (scheduled or not); commands never wait for one.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        self._hass = hass
+        self._default_max_concurrent = max_concurrent
+        self._max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        # Limit configured by each config entry; the highest one applies
+        self._limits: dict[str, int] = {}
+        self._jobs: dict[str, _ScheduledJob] = {}
+        self._slot_counter = 0
+        self._epoch = hass.loop.time()
+
+    @callback
+    def async_add_job(
+        self,
+        name: str,
+        action: Callable[[], Awaitable[None]],
+        interval: Callable[[], float | None],
+    ) -> Callable[[], None]:
+        """Run action periodically in its own slot; return an unsubscribe."""
+        self.async_remove_job(name)
+
+        phase = (self._slot_counter * _PHASE_STEP) % 1
+        self._slot_counter += 1
+        job = _ScheduledJob(name, action, interval, phase)
+        self._jobs[name] = job
+        self._async_schedule(job)
+
+        @callback
+        def _unsubscribe() -> None:
+            if self._jobs.get(name) is job:
+                self.async_remove_job(name)
+
+        return _unsubscribe
+
+    @callback
+    def async_remove_job(self, name: str) -> None:
+        """Stop a job and release its slot."""
+        job = self._jobs.pop(name, None)
+        if job and job.handle:
+            job.handle.cancel()
+            job.handle = None
+
+    @callback
+    def async_set_request_limit(self, owner: str, limit: int | None) -> None:
+        """Set (or with None, forget) the request cap wanted by `owner`."""
+        if limit is None:
+            self._limits.pop(owner, None)
+        else:
+            self._limits[owner] = limit
+        max_concurrent = max(
+            self._limits.values(), default=self._default_max_concurrent
+        )
+        if max_concurrent != self._max_concurrent:
+            # Requests holding a slot release it to the old semaphore
+            self._max_concurrent = max_concurrent
+            self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    @asynccontextmanager
+    async def async_request_slot(self) -> AsyncIterator[None]:
+        """Hold one of the shared slots for the duration of a request."""
+        async with self._semaphore:
+            yield
+
+    @property
+    def job_count(self) -> int:
+        """Number of periodic jobs currently registered."""
+        return len(self._jobs)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the registered jobs and their slots, for diagnostics."""
+        now = self._hass.loop.time()
+        return {
+            "max_concurrent": self._max_concurrent,
+            "jobs": {
+                name: {
+                    "interval": job.scheduled_interval,
+                    "phase": round(job.phase, 3),
+                    "next_run_in": (
+                        round(job.handle.when() - now, 3) if job.handle else None
+                    ),
+                    "running": job.running,
+                    "skipped": job.skipped,
+                }
+                for name, job in self._jobs.items()
+            },
+        }
+
+    @callback
+    def _async_schedule(self, job: _ScheduledJob) -> None:
+        interval = job.interval()
+        job.scheduled_interval = interval
+        if job.handle:
+            job.handle.cancel()
+            job.handle = None
+        if not interval or interval <= 0:
+            return
+
+        now = self._hass.loop.time()
+        offset = self._epoch + job.phase * interval
+        # Skip a slot that is still within the jitter window: the job may
+        # just have fired early for it.
+        cycles = math.floor((now - offset) / interval + SCHEDULER_JITTER) + 1
+        jitter = random.uniform(-SCHEDULER_JITTER, SCHEDULER_JITTER) * interval
+        when = max(now, offset + cycles * interval + jitter)
+        job.handle = self._hass.loop.call_at(when, self._async_fire, job)
+
+    @callback
+    def _async_fire(self, job: _ScheduledJob) -> None:
+        job.handle = None
+        if self._jobs.get(job.name) is not job:
+            return
+
+        # Book the next slot right away so a slow request does not shift the
+        # cadence of this job.
+        self._async_schedule(job)
+
+        if job.running:
+            # Never stack runs of the same job (e.g. keep-alive on a slow link)
+            job.skipped += 1
+            _LOGGER.debug(
+                "Candy Bianca scheduler: %s still running, slot skipped", job.name
+            )
+            return
+
+        job.running = True
+        self._hass.async_create_background_task(
+            self._async_run(job), f"candy_bianca {job.name}"
+        )
+
+    async def _async_run(self, job: _ScheduledJob) -> None:
+        try:
+            await job.action()
+        except Exception:  # noqa: BLE001
+            _LOGGER.exception("Candy Bianca scheduler: %s failed", job.name)
+        finally:
+            job.running = False
+
+        # The action may have changed the interval (adaptive polling)
+        if self._jobs.get(job.name) is job and job.interval() != job.scheduled_interval:
+            self._async_schedule(job)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> CandyBiancaScheduler:
+    """Return the scheduler shared by all config entries."""
+    scheduler: CandyBiancaScheduler | None = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = CandyBiancaScheduler(hass)
+    return scheduler
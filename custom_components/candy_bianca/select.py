@@ -6,6 +6,7 @@ import logging
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -14,6 +15,7 @@ from .const import (
     DOMAIN,
     DEFAULT_NAME,
     PROGRAM_PRESETS,
+    SIGNAL_PENDING_OPTIONS_CLEARED,
     SPIN_OPTIONS,
     TEMPERATURE_OPTIONS,
 )
@@ -60,6 +62,8 @@ class CandyBaseSelect(CoordinatorEntity, SelectEntity):
     """Base Select entity with shared device information."""
 
     _attr_has_entity_name = True
+    # Key of the selection in pending_options
+    _pending_key: str | None = None
 
     def __init__(
         self,
@@ -87,17 +91,53 @@ class CandyBaseSelect(CoordinatorEntity, SelectEntity):
 
         return True
 
+    def _extract_option(self) -> str | None:
+        """Return the pending selection, if it is one of the options."""
+        if self._pending_key is None:
+            return None
+        value = self._pending.get(self._pending_key)
+        if value is None:
+            return None
+        option = str(value)
+        return option if option in self._attr_options else None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # The selection lives in pending_options, not in the washer status:
+        # a start clearing it signals the selects, whatever the status does.
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_PENDING_OPTIONS_CLEARED.format(self._host),
+                self._async_refresh_option,
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._async_refresh_option()
+
+    @callback
+    def _async_refresh_option(self) -> None:
+        """Write state when the pending option changed."""
+        option = self._extract_option()
+        if option == self._attr_current_option:
+            return
+        self._attr_current_option = option
+        self.async_write_ha_state()
+
 
 class CandyProgramPresetSelect(CandyBaseSelect):
     """Select entity exposing the known Candy Bianca programs."""
 
     _attr_icon = "mdi:playlist-check"
     _attr_translation_key = "program_select"
+    _pending_key = "program_preset"
 
     def __init__(self, coordinator: CandyBiancaCoordinator, entry: ConfigEntry, data: dict) -> None:
         super().__init__(coordinator, entry, "program_select", "Program Preset", data)
         self._attr_options = list(PROGRAM_PRESETS)
-        self._attr_current_option = self._pending.get("program_preset")
+        self._attr_current_option = self._extract_option()
 
     async def async_select_option(self, option: str) -> None:
         program = PROGRAM_PRESETS.get(option)
@@ -110,17 +150,13 @@ class CandyProgramPresetSelect(CandyBaseSelect):
         self._attr_current_option = option
         self.async_write_ha_state()
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        self._attr_current_option = self._pending.get("program_preset")
-        super()._handle_coordinator_update()
-
 
 class CandyTemperatureSelect(CandyBaseSelect):
     """Select entity to change target temperature."""
 
     _attr_icon = "mdi:thermometer"
     _attr_translation_key = "temperature_select"
+    _pending_key = "temperature"
 
     def __init__(self, coordinator: CandyBiancaCoordinator, entry: ConfigEntry, data: dict) -> None:
         super().__init__(coordinator, entry, "temperature_select", "Temperature", data)
@@ -131,48 +167,25 @@ class CandyTemperatureSelect(CandyBaseSelect):
         self._attr_options = options
         self._attr_current_option = self._extract_option()
 
-    def _extract_option(self) -> str | None:
-        if self._pending.get("temperature") is not None:
-            option = str(int(self._pending.get("temperature", 0)))
-            return option if option in self._attr_options else None
-
-        return None
-
     async def async_select_option(self, option: str) -> None:
         self._pending["temperature"] = int(option)
         self._attr_current_option = option
         self.async_write_ha_state()
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        self._attr_current_option = self._extract_option()
-        super()._handle_coordinator_update()
-
 
 class CandySpinSelect(CandyBaseSelect):
     """Select entity to change spin speed."""
 
     _attr_icon = "mdi:sync-circle"
     _attr_translation_key = "spin_select"
+    _pending_key = "spin"
 
     def __init__(self, coordinator: CandyBiancaCoordinator, entry: ConfigEntry, data: dict) -> None:
         super().__init__(coordinator, entry, "spin_select", "Spin Speed", data)
         self._attr_options = [str(value) for value in SPIN_OPTIONS]
         self._attr_current_option = self._extract_option()
 
-    def _extract_option(self) -> str | None:
-        if self._pending.get("spin") is not None:
-            option = str(int(self._pending.get("spin", 0)))
-            return option if option in self._attr_options else None
-
-        return None
-
     async def async_select_option(self, option: str) -> None:
         self._pending["spin"] = int(option)
         self._attr_current_option = option
         self.async_write_ha_state()
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        self._attr_current_option = self._extract_option()
-        super()._handle_coordinator_update()
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timedelta
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, DEFAULT_NAME
+from .const import DIAGNOSTIC_UPDATE_INTERVAL, DOMAIN, DEFAULT_NAME
 from .coordinator import CandyBiancaCoordinator
-from .programs import get_program_name, get_program_short_name
+from .metrics import REQUEST_KINDS
+from .status import WasherStatus
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -49,7 +57,30 @@ async def async_setup_entry(
         DelaySensor(coordinator, entry),
         RemTimeSensor(coordinator, entry),
         StatisticsSensor(coordinator, entry),
+        LastUpdateSensor(coordinator, entry),
+        DataAgeSensor(coordinator, entry),
+        ConsecutiveFailuresSensor(coordinator, entry),
+        ErrorRateSensor(coordinator, entry),
     ]
+    entities.extend(
+        LatencySensor(
+            coordinator,
+            entry,
+            f"latency_{kind}",
+            f"{kind.replace('_', '-').capitalize()} Latency",
+            coordinator.client.metrics[kind],
+        )
+        for kind in REQUEST_KINDS
+    )
+    entities.append(
+        LatencySensor(
+            coordinator,
+            entry,
+            "command_latency",
+            "Command Latency",
+            coordinator.command_metrics,
+        )
+    )
 
     async_add_entities(entities)
 
@@ -58,6 +89,8 @@ class CandyBaseSensor(CoordinatorEntity, SensorEntity):
     """Base class for Candy Bianca sensors."""
 
     _attr_has_entity_name = True
+    # Status fields the state is computed from
+    _source_keys: frozenset[str] = frozenset()
 
     def __init__(self, coordinator: CandyBiancaCoordinator, entry: ConfigEntry, key: str, name: str):
         super().__init__(coordinator)
@@ -72,57 +105,51 @@ class CandyBaseSensor(CoordinatorEntity, SensorEntity):
         )
 
     @property
-    def _data(self) -> dict:
-        return self.coordinator.data or {}
+    def _status(self) -> WasherStatus:
+        return self.coordinator.status
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        changed = self.coordinator.changed_keys
+        if changed is not None and changed.isdisjoint(self._source_keys):
+            return
+        super()._handle_coordinator_update()
 
 
 class WifiStatusSensor(CandyBaseSensor):
     _attr_icon = "mdi:wifi"
+    _source_keys = frozenset({"WiFiStatus"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "wifi_status", "WiFi Status")
 
     @property
     def native_value(self):
-        v = int(self._data.get("WiFiStatus", 99))
-        return {0: "No-Wifi", 1: "Wifi"}.get(v, "Unavailable")
+        return self._status.wifi_status
 
 
 class OnOffStatusSensor(CandyBaseSensor):
     _attr_icon = "mdi:power-standby"
+    _source_keys = frozenset({"OnOffStatus", "MachMd"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "on_off_status", "On/Off Status")
 
     @property
     def native_value(self):
-        raw_on_off = self._data.get("OnOffStatus")
-        if raw_on_off is not None:
-            try:
-                v = int(raw_on_off)
-            except (TypeError, ValueError):
-                return "Unavailable"
-            return {0: "Off", 1: "On"}.get(v, "Unavailable")
-
-        mach_mode = self._data.get("MachMd")
-        if mach_mode is None:
-            return "Unavailable"
-
-        try:
-            return "On" if int(mach_mode) > 0 else "Off"
-        except (TypeError, ValueError):
-            return "Unavailable"
+        return self._status.on_off_status
 
 
 class ErrorSensor(CandyBaseSensor):
     _attr_icon = "mdi:alert-circle-outline"
+    _source_keys = frozenset({"Err"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "err", "Errors")
 
     @property
     def native_value(self):
-        v = int(self._data.get("Err", 255))
+        v = self._status.error
         if v == 0:
             return "Good"
         if v == 255:
@@ -132,236 +159,305 @@ class ErrorSensor(CandyBaseSensor):
 
 class MachModeSensor(CandyBaseSensor):
     _attr_icon = "mdi:washing-machine"
+    _source_keys = frozenset({"MachMd"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "machmd", "Status")
 
     @property
     def native_value(self):
-        v = int(self._data.get("MachMd", -1))
-        mapping = {
-            0: "Unavailable",
-            1: "Stopped",
-            2: "Washing",
-            3: "Unknown_3",
-            4: "Paused",
-            5: "Delayed",
-            6: "Unknown_6",
-            7: "Finished",
-        }
-        return mapping.get(v, "Unavailable")
+        return self._status.mode_label
 
 
 class MachModeIntSensor(CandyBaseSensor):
     _attr_icon = "mdi:washing-machine"
+    _source_keys = frozenset({"MachMd"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "machmd_int", "Status (int)")
 
     @property
     def native_value(self):
-        return int(self._data.get("MachMd", -1))
+        return self._status.mode
 
 
 class PrSensor(CandyBaseSensor):
     _attr_icon = "mdi:numeric"
+    _source_keys = frozenset({"Pr"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "pr", "Pr")
 
     @property
     def native_value(self):
-        return int(self._data.get("Pr", -1))
+        return self._status.pr
 
 
 class PrCodeSensor(CandyBaseSensor):
     _attr_icon = "mdi:numeric"
+    _source_keys = frozenset({"PrCode"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "prcode", "PrCode")
 
     @property
     def native_value(self):
-        return int(self._data.get("PrCode", -1))
+        return self._status.pr_code
 
 
 class SLevelSensor(CandyBaseSensor):
     _attr_icon = "mdi:liquid-spot"
+    _source_keys = frozenset({"SLevel"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "slevel", "Soil Level")
 
     @property
     def native_value(self):
-        return int(self._data.get("SLevel", -1))
+        return self._status.soil_level
 
 
 class PhaseSensor(CandyBaseSensor):
     _attr_icon = "mdi:progress-clock"
+    _source_keys = frozenset({"PrPh"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "phase", "Phase")
 
     @property
     def native_value(self):
-        v = int(self._data.get("PrPh", -1))
-        mapping = {
-            0: "Unavailable",
-            1: "Prewash",
-            2: "Wash",
-            3: "Rinse",
-            4: "Spin",
-            5: "End",
-            6: "Drying",
-            7: "Steam",
-            8: "Good Night",
-        }
-        return mapping.get(v, "Unavailable")
+        return self._status.phase_label
 
 
 class ProgramSensor(CandyBaseSensor):
     _attr_icon = "mdi:playlist-check"
+    _source_keys = frozenset({"PrCode", "Pr", "SLevel", "DryT"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "program", "Program")
 
     @property
     def native_value(self):
-        return get_program_name(self._data)
+        return self._status.program_name
 
 
 class ProgramShortSensor(CandyBaseSensor):
     _attr_icon = "mdi:playlist-edit"
+    _source_keys = frozenset({"PrCode", "Pr", "SLevel", "DryT"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "program_short", "Program (short)")
 
     @property
     def native_value(self):
-        return get_program_short_name(self._data)
+        return self._status.program_short_name
 
 
 class TempSensor(CandyBaseSensor):
     _attr_icon = "mdi:thermometer"
     _attr_native_unit_of_measurement = "°C"
+    _source_keys = frozenset({"Temp"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "temp", "Temperature")
 
     @property
     def native_value(self):
-        return int(self._data.get("Temp", 0))
+        return self._status.temperature
 
 
 class SpinSensor(CandyBaseSensor):
     _attr_icon = "mdi:sync-circle"
+    _source_keys = frozenset({"SpinSp"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "spin", "Spin Speed")
 
     @property
     def native_value(self):
-        return int(self._data.get("SpinSp", 0))
+        return self._status.spin
 
 
 class SteamSensor(CandyBaseSensor):
     _attr_icon = "mdi:weather-fog"
+    _source_keys = frozenset({"Steam"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "steam", "Steam")
 
     @property
     def native_value(self):
-        return int(self._data.get("Steam", 0))
+        return self._status.steam
 
 
 class DryModeSensor(CandyBaseSensor):
     _attr_icon = "mdi:tumble-dryer"
+    _source_keys = frozenset({"DryT"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "dry_mode", "Dry Mode")
 
     @property
     def native_value(self):
-        v = int(self._data.get("DryT", 0))
-        return {
-            0: "None",
-            1: "Extra asciutto",
-            2: "Pronto stiro",
-            3: "Pronto armadio",
-        }.get(v, "None")
+        return self._status.dry_mode_label
 
 
 class DelaySensor(CandyBaseSensor):
     _attr_icon = "mdi:timer-sand"
     _attr_native_unit_of_measurement = "h"
+    _source_keys = frozenset({"DelVal"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "delay", "Delay")
 
     @property
     def native_value(self):
-        v = int(self._data.get("DelVal", 0))
-        return v // 60
+        return self._status.delay_minutes // 60
 
 
 class RemTimeSensor(CandyBaseSensor):
     _attr_icon = "mdi:timer-outline"
     _attr_native_unit_of_measurement = "min"
+    _source_keys = frozenset({"RemTime"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "remtime", "Remaining Time")
 
     @property
     def native_value(self):
-        v = int(self._data.get("RemTime", 0))
-        return v // 60 if v >= 0 else None
+        # A status without RemTime reads as nothing left, not as unknown
+        if "RemTime" not in self._status.raw:
+            return 0
+        v = self._status.remaining_seconds
+        return v // 60 if v is not None else None
 
 
 class StatisticsSensor(CandyBaseSensor):
     _attr_icon = "mdi:chart-bar"
+    _source_keys = frozenset({"statistics"})
 
     def __init__(self, coordinator, entry):
         super().__init__(coordinator, entry, "statistics", "Usage Statistics")
 
     @property
-    def _statistics(self) -> dict | None:
-        counters = self._data.get("statistics")
-        if isinstance(counters, dict):
-            return counters
-        return None
+    def native_value(self):
+        return self._status.statistics_total
+
+    @property
+    def extra_state_attributes(self):
+        return self._status.statistics
+
+
+class CandyDiagnosticSensor(CandyBaseSensor):
+    """Health of the link to the washer rather than washer state.
+
+    The values change with every request, not with the status payload, so
+    they are refreshed on a timer and written only when they changed.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._last_written = self._diagnostic_state()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_refresh_diagnostics,
+                timedelta(seconds=DIAGNOSTIC_UPDATE_INTERVAL),
+            )
+        )
+
+    @callback
+    def _async_refresh_diagnostics(self, _now: datetime) -> None:
+        state = self._diagnostic_state()
+        if state != self._last_written:
+            self._last_written = state
+            self.async_write_ha_state()
+
+    def _diagnostic_state(self):
+        return self.native_value
+
+
+class LastUpdateSensor(CandyDiagnosticSensor):
+    _attr_icon = "mdi:clock-check-outline"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, "last_update", "Last Update")
 
     @property
     def native_value(self):
-        counters = self._statistics
-        if not counters:
-            return None
+        return self.coordinator.last_success
 
-        parsed_values: list[int] = []
-        for value in counters.values():
-            try:
-                parsed_values.append(int(value))
-            except (TypeError, ValueError):
-                continue
 
-        if not parsed_values:
-            return None
+class DataAgeSensor(CandyDiagnosticSensor):
+    _attr_icon = "mdi:timer-sand-complete"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "s"
 
-        return sum(parsed_values)
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, "data_age", "Data Age")
 
     @property
-    def extra_state_attributes(self):
-        counters = self._statistics
-        if not counters:
-            return None
+    def native_value(self):
+        age = self.coordinator.data_age
+        return round(age) if age is not None else None
+
+
+class ConsecutiveFailuresSensor(CandyDiagnosticSensor):
+    _attr_icon = "mdi:lan-disconnect"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, entry):
+        super().__init__(
+            coordinator, entry, "consecutive_failures", "Consecutive Failures"
+        )
+
+    @property
+    def native_value(self):
+        return self.coordinator.consecutive_failures
+
+
+class ErrorRateSensor(CandyDiagnosticSensor):
+    _attr_icon = "mdi:percent-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "%"
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, "error_rate", "Error Rate")
 
-        parsed: dict[str, int] = {}
-        for key, value in counters.items():
-            try:
-                parsed[key] = int(value)
-            except (TypeError, ValueError):
-                continue
+    @property
+    def native_value(self):
+        rate = self.coordinator.client.error_rate
+        return round(rate * 100, 1) if rate is not None else None
 
-        return parsed or None
 
+class LatencySensor(CandyDiagnosticSensor):
+    """p95 of a latency metric, p50/p99 as attributes."""
+
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "ms"
 
+    def __init__(self, coordinator, entry, key: str, name: str, metrics):
+        super().__init__(coordinator, entry, key, name)
+        self._metrics = metrics
+
+    def _diagnostic_state(self):
+        return self._metrics.percentiles(), self._metrics.requests
+
+    @property
+    def native_value(self):
+        return self._metrics.percentiles()["p95"]
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            **self._metrics.percentiles(),
+            "samples": self._metrics.samples,
+            "requests": self._metrics.requests,
+            "errors": self._metrics.errors,
+        }
@@ -0,0 +1,134 @@
+"""Typed snapshot of the washer status, decoded once per update."""
+from __future__ import annotations
+
+from typing import Any, Mapping, NamedTuple
+
+from .programs import ProgramMapping, match_program
+from .util import safe_int
+
+WIFI_STATUSES: dict[int, str] = {0: "No-Wifi", 1: "Wifi"}
+ON_OFF_STATUSES: dict[int, str] = {0: "Off", 1: "On"}
+MACHINE_MODES: dict[int, str] = {
+    0: "Unavailable",
+    1: "Stopped",
+    2: "Washing",
+    3: "Unknown_3",
+    4: "Paused",
+    5: "Delayed",
+    6: "Unknown_6",
+    7: "Finished",
+}
+PHASES: dict[int, str] = {
+    0: "Unavailable",
+    1: "Prewash",
+    2: "Wash",
+    3: "Rinse",
+    4: "Spin",
+    5: "End",
+    6: "Drying",
+    7: "Steam",
+    8: "Good Night",
+}
+DRY_MODES: dict[int, str] = {
+    0: "None",
+    1: "Extra asciutto",
+    2: "Pronto stiro",
+    3: "Pronto armadio",
+}
+
+
+class WasherStatus(NamedTuple):
+    """Immutable, pre-decoded view of a statusLavatrice payload.
+
+    Integers are already coerced, enum labels resolved, the program matched
+    and the statistics counters parsed, so entities only read attributes.
+    """
+
+    raw: Mapping[str, Any]
+    wifi_status: str
+    on_off_status: str
+    error: int
+    mode: int
+    mode_label: str
+    pr: int
+    pr_code: int
+    soil_level: int
+    phase: int
+    phase_label: str
+    program: ProgramMapping | None
+    program_name: str
+    program_short_name: str
+    temperature: int
+    spin: int
+    steam: int
+    dry_mode: int
+    dry_mode_label: str
+    delay_minutes: int
+    remaining_seconds: int | None
+    statistics: dict[str, int] | None
+    statistics_total: int | None
+
+    @classmethod
+    def from_dict(cls, raw: Mapping[str, Any]) -> WasherStatus:
+        """Decode a raw status dict (as stored in coordinator.data)."""
+        mode = safe_int(raw.get("MachMd"))
+        phase = safe_int(raw.get("PrPh"))
+        dry_mode = safe_int(raw.get("DryT", 0), 0)
+        remaining = safe_int(raw.get("RemTime"))
+        program = match_program(raw)
+
+        statistics: dict[str, int] | None = None
+        counters = raw.get("statistics")
+        if isinstance(counters, dict):
+            statistics = {}
+            for key, value in counters.items():
+                try:
+                    statistics[key] = int(value)
+                except (TypeError, ValueError):
+                    continue
+
+        return cls(
+            raw=raw,
+            wifi_status=WIFI_STATUSES.get(
+                safe_int(raw.get("WiFiStatus", 99), 99), "Unavailable"
+            ),
+            on_off_status=_on_off_status(raw),
+            error=safe_int(raw.get("Err", 255), 255),
+            mode=mode,
+            mode_label=MACHINE_MODES.get(mode, "Unavailable"),
+            pr=safe_int(raw.get("Pr")),
+            pr_code=safe_int(raw.get("PrCode")),
+            soil_level=safe_int(raw.get("SLevel")),
+            phase=phase,
+            phase_label=PHASES.get(phase, "Unavailable"),
+            program=program,
+            program_name=program.full_name if program else "Other",
+            program_short_name=program.short_name if program else "Other",
+            temperature=safe_int(raw.get("Temp", 0), 0),
+            spin=safe_int(raw.get("SpinSp", 0), 0),
+            steam=safe_int(raw.get("Steam", 0), 0),
+            dry_mode=dry_mode,
+            dry_mode_label=DRY_MODES.get(dry_mode, "None"),
+            delay_minutes=safe_int(raw.get("DelVal", 0), 0),
+            remaining_seconds=remaining if remaining >= 0 else None,
+            statistics=statistics or None,
+            statistics_total=sum(statistics.values()) if statistics else None,
+        )
+
+
+def _on_off_status(raw: Mapping[str, Any]) -> str:
+    raw_on_off = raw.get("OnOffStatus")
+    if raw_on_off is not None:
+        return ON_OFF_STATUSES.get(safe_int(raw_on_off), "Unavailable")
+
+    mach_mode = raw.get("MachMd")
+    if mach_mode is None:
+        return "Unavailable"
+
+    try:
+        return "On" if int(mach_mode) > 0 else "Off"
+    except (TypeError, ValueError):
+        return "Unavailable"
+
+
+EMPTY_STATUS = WasherStatus.from_dict({})
@@ -0,0 +1,145 @@
+"""Index of the washers targeted by service calls."""
+from __future__ import annotations
+
+import logging
+from typing import Any, Iterable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_ENTITY_ID
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import async_extract_config_entry_ids
+
+from .const import CONF_HOST, DATA_TARGET_INDEX
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_HOST = "host"
+# Targets that need the area/label/floor registries to be resolved
+_REGISTRY_TARGETS = (ATTR_AREA_ID, "floor_id", "label_id")
+
+
+class TargetIndex:
+    """Map entity ids, device ids and hosts to the config entries of washers.
+
+    Entries are indexed when they are set up and dropped when unloaded;
+    registry events keep the index current when entities or devices are
+    added, renamed or removed in between. Resolving entity, device or host
+    targets is then a few dictionary lookups, without registry scans.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entities: dict[str, str] = {}
+        self._devices: dict[str, str] = {}
+        self._hosts: dict[str, str] = {}
+        # entry_id -> host of every indexed washer
+        self._entries: dict[str, str] = {}
+        self._unsubs = [
+            hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_updated
+            ),
+            hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+            ),
+        ]
+
+    @callback
+    def async_add_entry(self, entry: ConfigEntry) -> None:
+        """Index a washer and the entities and devices it registered."""
+        entry_id = entry.entry_id
+        self._hosts[entry.data[CONF_HOST]] = entry_id
+        self._entries[entry_id] = entry.data[CONF_HOST]
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(self._hass), entry_id
+        ):
+            self._entities[entity.entity_id] = entry_id
+        for device in dr.async_entries_for_config_entry(
+            dr.async_get(self._hass), entry_id
+        ):
+            self._devices[device.id] = entry_id
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        self._entries.pop(entry_id, None)
+        for mapping in (self._entities, self._devices, self._hosts):
+            for key in [key for key, value in mapping.items() if value == entry_id]:
+                del mapping[key]
+
+    @callback
+    def async_close(self) -> None:
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+
+    async def async_resolve(self, call: ServiceCall) -> list[str]:
+        """Return the entry ids of the washers a service call targets."""
+        data = call.data
+        entry_ids: set[str] = set()
+        for mapping, key in (
+            (self._entities, ATTR_ENTITY_ID),
+            (self._devices, ATTR_DEVICE_ID),
+            (self._hosts, ATTR_HOST),
+        ):
+            for target in _as_list(data.get(key)):
+                if (entry_id := mapping.get(target)) is not None:
+                    entry_ids.add(entry_id)
+                else:
+                    _LOGGER.debug("%s %s is not a Candy Bianca washer", key, target)
+        if any(data.get(key) for key in _REGISTRY_TARGETS):
+            # Area, floor and label membership changes with every registry
+            # edit: let Home Assistant expand them
+            entry_ids.update(
+                entry_id
+                for entry_id in await async_extract_config_entry_ids(self._hass, call)
+                if entry_id in self._entries
+            )
+        return sorted(entry_ids)
+
+    @callback
+    def _async_entity_updated(self, event: Event) -> None:
+        action = event.data["action"]
+        entity_id = event.data["entity_id"]
+        if action == "remove":
+            self._entities.pop(entity_id, None)
+            return
+        if old_entity_id := event.data.get("old_entity_id"):
+            self._entities.pop(old_entity_id, None)
+        entity = er.async_get(self._hass).async_get(entity_id)
+        if entity is not None and entity.config_entry_id in self._entries:
+            self._entities[entity_id] = entity.config_entry_id
+        else:
+            self._entities.pop(entity_id, None)
+
+    @callback
+    def _async_device_updated(self, event: Event) -> None:
+        device_id = event.data["device_id"]
+        self._devices.pop(device_id, None)
+        if event.data["action"] == "remove":
+            return
+        device = dr.async_get(self._hass).async_get(device_id)
+        if device is None:
+            return
+        for entry_id in device.config_entries:
+            if entry_id in self._entries:
+                self._devices[device_id] = entry_id
+                break
+
+
+@callback
+def async_get_target_index(hass: HomeAssistant) -> TargetIndex:
+    """Return the target index shared by all config entries."""
+    index: TargetIndex | None = hass.data.get(DATA_TARGET_INDEX)
+    if index is None:
+        index = hass.data[DATA_TARGET_INDEX] = TargetIndex(hass)
+    return index
+
+
+def _as_list(value: Any) -> Iterable[str]:
+    if not value:
+        return ()
+    if isinstance(value, str):
+        # Templates and YAML may pass "a, b"
+        return [item.strip() for item in value.split(",")]
+    return value
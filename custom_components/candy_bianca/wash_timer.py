@@ -9,7 +9,6 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import CONF_TIMER_ENTITY
-from .util import safe_int
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,20 +24,24 @@ class WashTimerManager:
         self._active = False
 
         if self._timer_entity:
-            data = coordinator.data or {}
-            current_mode = safe_int(data.get("MachMd"))
-            remaining_seconds = _get_remaining_seconds(data)
+            status = coordinator.status
+            current_mode = status.mode
+            remaining_seconds = status.remaining_seconds
             self._active = _is_running(current_mode, remaining_seconds)
             self._unsubscribe = coordinator.async_add_listener(self._handle_coordinator_update)
             self._handle_coordinator_update()
 
+    def as_dict(self) -> dict[str, Any]:
+        """Return the manager state, for diagnostics."""
+        return {"timer_entity": self._timer_entity, "active": self._active}
+
     def _handle_coordinator_update(self) -> None:
         if not self._timer_entity:
             return
 
-        data: dict[str, Any] = self._coordinator.data or {}
-        current_mode = safe_int(data.get("MachMd"))
-        remaining_seconds = _get_remaining_seconds(data)
+        status = self._coordinator.status
+        current_mode = status.mode
+        remaining_seconds = status.remaining_seconds
 
         is_running = _is_running(current_mode, remaining_seconds)
 
@@ -105,13 +108,6 @@ def _format_duration(seconds: int) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds_left:02d}"
 
 
-def _get_remaining_seconds(data: dict[str, Any]) -> int | None:
-    remaining_seconds = safe_int(data.get("RemTime"))
-    if remaining_seconds < 0:
-        return None
-    return remaining_seconds
-
-
 def _is_running(mode: int, remaining_seconds: int | None) -> bool:
     if remaining_seconds is not None and remaining_seconds > 0:
         return True
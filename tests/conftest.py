@@ -0,0 +1,61 @@
+"""Fixtures shared by the tests running the integration in Home Assistant."""
+from __future__ import annotations
+
+import pytest
+from homeassistant.const import CONF_HOST
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.candy_bianca import coordinator as coordinator_module
+from custom_components.candy_bianca.const import CONF_KEEP_ALIVE_INTERVAL, DOMAIN
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--perf",
+        action="store_true",
+        help="run the timing and load benchmarks marked with 'perf'",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "perf: timing or load benchmark, only run with --perf"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--perf"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --perf")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def fast_confirmation(monkeypatch):
+    """Shorten the status reads that confirm a command."""
+    monkeypatch.setattr(coordinator_module, "COMMAND_CONFIRM_DELAYS", (0.05,) * 3)
+
+
+@pytest.fixture
+def setup_washer(hass):
+    """Return a coroutine setting up a washer entry and its coordinator.
+
+    The keep-alive loop runs once an hour unless the options say otherwise,
+    so only the requests a test makes reach the washer.
+    """
+
+    async def _async_setup_washer(host: str, **options):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_HOST: host},
+            options={CONF_KEEP_ALIVE_INTERVAL: 3600, **options},
+            unique_id=host,
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        return entry, hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    return _async_setup_washer
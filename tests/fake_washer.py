@@ -0,0 +1,176 @@
+"""Local HTTP server emulating the web API of Candy Bianca washers."""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from aiohttp import web
+
+from custom_components.candy_bianca.const import (
+    ENDPOINT_READ,
+    ENDPOINT_STATISTICS,
+    ENDPOINT_WRITE,
+)
+
+IDLE_STATUS: dict[str, str] = {
+    "WiFiStatus": "1",
+    "Err": "0",
+    "MachMd": "1",
+    "Pr": "1",
+    "PrPh": "0",
+    "SLevel": "0",
+    "Temp": "40",
+    "SpinSp": "10",
+    "Steam": "0",
+    "DryT": "0",
+    "DelVal": "0",
+    "RemTime": "0",
+    "PrCode": "65",
+}
+
+
+@dataclass
+class FakeWasherConfig:
+    """Network behaviour of an emulated washer."""
+
+    latency: float = 0.02  # seconds before answering
+    statistics_latency: float = 0.0  # added to the latency of the counters
+    jitter: float = 0.0  # uniform +/- seconds added to the latency
+    failure_rate: float = 0.0  # fraction of requests whose connection drops
+    # The real web server handles one request at a time: the others wait
+    single_connection: bool = True
+
+
+class FakeWasher:
+    """One emulated washer: status and counters endpoints, start/stop commands.
+
+    Subclasses may override `status`, `counters` and `command` to emulate
+    more than an idle machine.
+    """
+
+    def __init__(self, config: FakeWasherConfig | None = None, seed: int = 0) -> None:
+        self.config = config or FakeWasherConfig()
+        self.requests: Counter[str] = Counter()
+        self.dropped = 0
+        self.max_concurrent = 0
+        self._active = 0
+        self._status = dict(IDLE_STATUS)
+        self._counters = {"totalWashCycles": "0"}
+        self._random = random.Random(seed)
+        self._lock: asyncio.Lock | None = None
+
+    def status(self) -> dict[str, Any]:
+        return self._status
+
+    def counters(self) -> dict[str, Any]:
+        return self._counters
+
+    def command(self, params: dict[str, str]) -> None:
+        if params.get("StSt") == "1":
+            self._status["MachMd"] = "2"
+        elif params.get("StSt") == "0":
+            self._status["MachMd"] = "1"
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(f"/{ENDPOINT_READ}", self._handle)
+        app.router.add_get(f"/{ENDPOINT_STATISTICS}", self._handle)
+        app.router.add_get(f"/{ENDPOINT_WRITE}", self._handle)
+        return app
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Requests in progress at once, whether or not they wait for the lock
+        self._active += 1
+        self.max_concurrent = max(self.max_concurrent, self._active)
+        try:
+            if not self.config.single_connection:
+                return await self._answer(request)
+            async with self._lock:
+                return await self._answer(request)
+        finally:
+            self._active -= 1
+
+    async def _answer(self, request: web.Request) -> web.StreamResponse:
+        endpoint = request.path.lstrip("/")
+        self.requests[endpoint] += 1
+        delay = self.config.latency + self._random.uniform(
+            -self.config.jitter, self.config.jitter
+        )
+        if endpoint == ENDPOINT_STATISTICS:
+            delay += self.config.statistics_latency
+        await asyncio.sleep(max(0.0, delay))
+        if self._random.random() < self.config.failure_rate:
+            # Emulate the washer dropping off the Wi-Fi mid request
+            self.dropped += 1
+            request.transport.close()
+            raise web.HTTPServiceUnavailable
+
+        if endpoint == ENDPOINT_WRITE:
+            self.command(dict(request.query))
+            return web.Response(text="")
+        if endpoint == ENDPOINT_STATISTICS:
+            payload = {"statusCounters": self.counters()}
+        else:
+            payload = {"statusLavatrice": self.status()}
+        # The firmware answers JSON with a text/html content type
+        return web.Response(body=json.dumps(payload).encode(), content_type="text/html")
+
+
+class FakeWasherFleet:
+    """Serve fake washers on localhost ports from a background event loop.
+
+    The servers run in their own thread so that their CPU time and event
+    loop load do not pollute measurements taken on the Home Assistant loop.
+    """
+
+    def __init__(self, washers: list[FakeWasher]) -> None:
+        self.washers = washers
+        self.hosts: list[str] = []
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._runners: list[web.AppRunner] = []
+
+    def start(self) -> list[str]:
+        """Start one server per washer; return their `host:port` strings."""
+        self._thread.start()
+        self.hosts = asyncio.run_coroutine_threadsafe(
+            self._async_start(), self._loop
+        ).result()
+        return self.hosts
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._async_stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _async_start(self) -> list[str]:
+        hosts = []
+        for washer in self.washers:
+            runner = web.AppRunner(washer.app(), access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            self._runners.append(runner)
+            port = runner.addresses[-1][1]
+            hosts.append(f"127.0.0.1:{port}")
+        return hosts
+
+    async def _async_stop(self) -> None:
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners.clear()
+
+    def __enter__(self) -> FakeWasherFleet:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.candy_bianca import breaker as breaker_module
+from custom_components.candy_bianca.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the breaker with a manual clock and no backoff jitter."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(breaker_module, "monotonic", lambda: now.value)
+    monkeypatch.setattr(
+        breaker_module, "random", SimpleNamespace(uniform=lambda low, high: 1.0)
+    )
+    return now
+
+
+def _open() -> CircuitBreaker:
+    breaker = CircuitBreaker("washer", failure_threshold=3, backoff_base=5)
+    for _ in range(3):
+        breaker.before_request()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_failure_threshold(clock):
+    breaker = CircuitBreaker("washer", failure_threshold=3, backoff_base=5)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    assert not breaker.is_open
+
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.is_open
+    assert breaker.trips == 1
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_single_probe_after_cooldown(clock):
+    breaker = _open()
+    clock.value += 4.9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.value += 0.2
+    assert not breaker.is_open
+    breaker.before_request()
+    assert breaker.state == STATE_HALF_OPEN
+    # Only one probe at a time
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_half_open_success_closes(clock):
+    breaker = _open()
+    clock.value += 5
+    breaker.before_request()
+    breaker.record_success()
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.consecutive_failures == 0
+    breaker.before_request()
+    # A new outage needs the full threshold again
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_failure_reopens_for_longer(clock):
+    breaker = _open()
+    clock.value += 5
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in == pytest.approx(10)
+    assert breaker.trips == 1
+    clock.value += 10
+    breaker.before_request()
+    assert breaker.state == STATE_HALF_OPEN
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.candy_bianca.capture import (
+    TrafficCapture,
+    async_replay,
+    read_capture,
+)
+from custom_components.candy_bianca.const import (
+    DOMAIN,
+    ENDPOINT_READ,
+    ENDPOINT_STATISTICS,
+)
+
+from washer_simulator import WashCycleSimulator
+
+
+def _body(section: str, payload: dict) -> bytes:
+    return json.dumps({section: payload}).encode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["capture.jsonl", "capture.jsonl.gz"])
+async def test_capture_rotates_and_reads_back(hass, tmp_path, name):
+    capture = TrafficCapture(hass, tmp_path / name, max_bytes=4000, backups=2)
+    for index in range(300):
+        body = _body("statusLavatrice", {"MachMd": str(index)})
+        capture.record(ENDPOINT_READ, body)
+    await capture.async_close()
+
+    responses = await hass.async_add_executor_job(read_capture, tmp_path / name, 2)
+    assert responses
+    assert len(list(tmp_path.iterdir())) <= 3
+    # Oldest first, and nothing after the last recorded response
+    assert [r.time for r in responses] == sorted(r.time for r in responses)
+    assert json.loads(responses[-1].body)["statusLavatrice"]["MachMd"] == "299"
+
+
+@pytest.mark.asyncio
+async def test_replay_drives_coordinator_and_entities(
+    hass, enable_custom_integrations, setup_washer, tmp_path
+):
+    # A washer that is not listening: only the replay feeds the coordinator
+    host = "127.0.0.1:9"
+    entry, coordinator = await setup_washer(host)
+
+    capture = TrafficCapture(hass, tmp_path / "capture.jsonl.gz")
+    simulator = WashCycleSimulator()
+    simulator.start_preset("Perfect Rapid 14 Min.")
+    for status in simulator.timeline(5):
+        capture.record(ENDPOINT_READ, _body("statusLavatrice", status))
+    capture.record(
+        ENDPOINT_STATISTICS, _body("statusCounters", simulator.counters())
+    )
+    await capture.async_close()
+
+    responses = await hass.async_add_executor_job(
+        read_capture, tmp_path / "capture.jsonl.gz"
+    )
+    requests = coordinator.client.requests
+    assert await async_replay(coordinator, responses, speed=None) == len(responses)
+    await hass.async_block_till_done()
+    # Replay never reaches out to the washer, not even for the statistics
+    assert coordinator.client.requests == requests
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{host}_machmd"
+    )
+    assert hass.states.get(entity_id).state == "Finished"
+    assert coordinator.status.statistics_total == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.candy_bianca.client import PRIORITY_READ, CandyBiancaClient
+from custom_components.candy_bianca.const import (
+    ENDPOINT_READ,
+    ENDPOINT_STATISTICS,
+    ENDPOINT_WRITE,
+)
+
+from fake_washer import FakeWasher, FakeWasherConfig, FakeWasherFleet
+
+
+@pytest.mark.asyncio
+async def test_read_after_write_does_not_join_earlier_read():
+    with FakeWasherFleet([FakeWasher(FakeWasherConfig(latency=0.2))]) as fleet:
+        client = CandyBiancaClient(fleet.hosts[0], freshness=0)
+        try:
+            before = asyncio.create_task(client.async_read(ENDPOINT_READ, 5))
+            await asyncio.sleep(0.05)
+            write = asyncio.create_task(client.async_write("Write=1&StSt=1", 5))
+            await asyncio.sleep(0)
+            after = asyncio.create_task(client.async_read(ENDPOINT_READ, 5))
+
+            assert (await before)["statusLavatrice"]["MachMd"] == "1"
+            await write
+            assert (await after)["statusLavatrice"]["MachMd"] == "2"
+            assert client.coalesced_reads == 0
+        finally:
+            await client.async_close()
+
+
+class RecordingWasher(FakeWasher):
+    """Remembers the order in which requests were answered."""
+
+    def __init__(self, config: FakeWasherConfig) -> None:
+        super().__init__(config)
+        self.answered: list[str] = []
+
+    def status(self):
+        self.answered.append(ENDPOINT_READ)
+        return super().status()
+
+    def counters(self):
+        self.answered.append(ENDPOINT_STATISTICS)
+        return super().counters()
+
+    def command(self, params):
+        self.answered.append(ENDPOINT_WRITE)
+        super().command(params)
+
+
+@pytest.mark.asyncio
+async def test_write_runs_ahead_of_queued_reads():
+    washer = RecordingWasher(FakeWasherConfig(latency=0.1))
+    with FakeWasherFleet([washer]) as fleet:
+        client = CandyBiancaClient(fleet.hosts[0], freshness=0)
+        try:
+            running = asyncio.create_task(client.async_read(ENDPOINT_READ, 5))
+            await asyncio.sleep(0.05)
+            queued = asyncio.create_task(
+                client.async_read(ENDPOINT_STATISTICS, 5, PRIORITY_READ)
+            )
+            await asyncio.sleep(0)
+            wait = await client.async_write("Write=1&StSt=1", 5)
+            await asyncio.gather(running, queued)
+
+            assert washer.answered == [
+                ENDPOINT_READ,
+                ENDPOINT_WRITE,
+                ENDPOINT_STATISTICS,
+            ]
+            # The command only waited for the read already on the wire
+            assert wait < 0.2
+        finally:
+            await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_pings_are_dropped_while_the_washer_is_busy():
+    washer = FakeWasher(FakeWasherConfig(latency=0.1))
+    with FakeWasherFleet([washer]) as fleet:
+        client = CandyBiancaClient(fleet.hosts[0], freshness=0)
+        try:
+            # Behind a read in progress
+            read = asyncio.create_task(client.async_read(ENDPOINT_READ, 5))
+            await asyncio.sleep(0)
+            await client.async_ping(5)
+            assert client.dropped_pings == 1
+            await read
+
+            # Queued behind a command, then overtaken by the next one
+            first = asyncio.create_task(client.async_write("Write=1&StSt=1", 5))
+            await asyncio.sleep(0.05)
+            ping = asyncio.create_task(client.async_ping(5))
+            await asyncio.sleep(0)
+            await client.async_write("Write=1&StSt=0", 5)
+            await asyncio.gather(first, ping)
+            assert client.dropped_pings == 2
+
+            assert washer.requests[ENDPOINT_READ] == 1
+            assert washer.requests[ENDPOINT_WRITE] == 2
+        finally:
+            await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_read_after_write_joins_queued_read():
+    with FakeWasherFleet([FakeWasher(FakeWasherConfig(latency=0.1))]) as fleet:
+        client = CandyBiancaClient(fleet.hosts[0], freshness=0)
+        try:
+            # Keep the connection busy so the status read stays queued
+            busy = asyncio.create_task(client.async_read(ENDPOINT_STATISTICS, 5))
+            await asyncio.sleep(0.05)
+            queued = asyncio.create_task(client.async_read(ENDPOINT_READ, 5))
+            await asyncio.sleep(0)
+            await client.async_write("Write=1&StSt=1", 5)
+            after = await client.async_read(ENDPOINT_READ, 5)
+
+            assert client.coalesced_reads == 1
+            assert await queued is after
+            assert after["statusLavatrice"]["MachMd"] == "2"
+            await busy
+        finally:
+            await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_write_leaves_one_status_read_after_it():
+    washer = RecordingWasher(FakeWasherConfig(latency=0.1))
+    with FakeWasherFleet([washer]) as fleet:
+        client = CandyBiancaClient(fleet.hosts[0], freshness=0)
+        try:
+            statistics = asyncio.create_task(
+                client.async_read(ENDPOINT_STATISTICS, 5)
+            )
+            await asyncio.sleep(0.05)
+            before = asyncio.create_task(client.async_read(ENDPOINT_READ, 5))
+            await asyncio.sleep(0)
+            write = asyncio.create_task(client.async_write("Write=1&StSt=1", 5))
+            await asyncio.sleep(0)
+            after = asyncio.create_task(client.async_read(ENDPOINT_READ, 5))
+            await asyncio.gather(statistics, before, write, after)
+
+            assert washer.answered == [
+                ENDPOINT_STATISTICS,
+                ENDPOINT_WRITE,
+                ENDPOINT_READ,
+            ]
+            assert washer.requests[ENDPOINT_READ] == 1
+        finally:
+            await client.async_close()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.candy_bianca import button as button_module
+from custom_components.candy_bianca.commands import (
+    START_MODES,
+    STOP_COMMAND,
+    build_start_command,
+)
+from custom_components.candy_bianca.const import DOMAIN
+
+from fake_washer import FakeWasher, FakeWasherFleet
+
+pytestmark = pytest.mark.usefixtures("fast_confirmation")
+
+
+class IgnoringWasher(FakeWasher):
+    """Accepts every command and never acts on it."""
+
+    def command(self, params: dict[str, str]) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_start_service_confirms_and_publishes(
+    hass, enable_custom_integrations, setup_washer
+):
+    washer = FakeWasher()
+    with FakeWasherFleet([washer]) as fleet:
+        host = fleet.hosts[0]
+        entry, coordinator = await setup_washer(host)
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "sensor", DOMAIN, f"{host}_machmd"
+        )
+
+        await hass.services.async_call(
+            DOMAIN,
+            "start",
+            {"entity_id": entity_id, "program_preset": "Cotone"},
+            blocking=True,
+        )
+
+        assert hass.states.get(entity_id).state == "Washing"
+        assert coordinator.command_metrics.requests == 1
+        assert coordinator.command_metrics.errors == 0
+        assert coordinator.command_metrics.percentiles()["p50"] is not None
+        assert washer.requests["http-write.json"] == 1
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_command_without_effect_is_retried_then_reported(
+    hass, enable_custom_integrations, setup_washer
+):
+    washer = IgnoringWasher()
+    with FakeWasherFleet([washer]) as fleet:
+        entry, coordinator = await setup_washer(fleet.hosts[0])
+
+        result = await coordinator.async_send_command(STOP_COMMAND, START_MODES)
+
+        assert not result.confirmed
+        assert result.attempts == 2
+        assert washer.requests["http-write.json"] == 2
+        assert coordinator.command_metrics.errors == 1
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_optimistic_state_is_rolled_back_without_effect(
+    hass, enable_custom_integrations, setup_washer
+):
+    with FakeWasherFleet([IgnoringWasher()]) as fleet:
+        host = fleet.hosts[0]
+        entry, coordinator = await setup_washer(host)
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "sensor", DOMAIN, f"{host}_machmd"
+        )
+        published: list[str] = []
+        unsub = coordinator.async_add_listener(
+            lambda: published.append(coordinator.data["MachMd"])
+        )
+
+        result = await coordinator.async_send_command(
+            build_start_command({}, {}, preset="Cotone", delay=60), START_MODES
+        )
+        await hass.async_block_till_done()
+
+        assert not result.confirmed
+        # Delayed start shown as soon as the write was accepted, then undone
+        assert published == ["5", "1"]
+        assert hass.states.get(entity_id).state == "Stopped"
+        assert coordinator.optimistic_rollbacks == 1
+
+        unsub()
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_button_reports_failure_after_timeout(
+    hass, enable_custom_integrations, setup_washer, monkeypatch
+):
+    monkeypatch.setattr(button_module, "DEFAULT_FLEET_TIMEOUT", 0.1)
+    with FakeWasherFleet([IgnoringWasher()]) as fleet:
+        host = fleet.hosts[0]
+        entry, _ = await setup_washer(host)
+        button_id = er.async_get(hass).async_get_entity_id(
+            "button", DOMAIN, f"{host}_stop_button"
+        )
+
+        await hass.services.async_call(
+            "button", "press", {"entity_id": button_id}, blocking=True
+        )
+
+        attributes = hass.states.get(button_id).attributes
+        assert attributes["last_action_success"] is False
+        assert "timed out" in attributes["last_action_detail"]
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from custom_components.candy_bianca.commands import (
+    PRESET_FRAGMENTS,
+    STOP_COMMAND,
+    build_start_command,
+)
+
+
+def test_explicit_values_take_priority():
+    params = build_start_command(
+        {"Temp": "40", "SpinSp": "800"},
+        {"program_preset": "Cotone", "temperature": 60},
+        program_url="PrNm=1&PrStr=My program",
+        temp=30,
+    )
+    assert params == (
+        "Write=1&StSt=1&PrNm=1&PrStr=My%20program&TmpTgt=30&SpdTgt=800&DelVl=0"
+    )
+
+
+def test_pending_preset_then_status_fallback():
+    params = build_start_command(
+        {"Temp": "40", "SpinSp": "800", "DelVal": "60"},
+        {"program_preset": "Cotone", "spin": 1000},
+    )
+    assert params == (
+        f"Write=1&StSt=1&{PRESET_FRAGMENTS['Cotone']}&TmpTgt=40&SpdTgt=1000&DelVl=0"
+    )
+
+
+def test_unknown_preset_falls_back_to_pending_url():
+    params = build_start_command({}, {"program_url": "PrNm=2"}, preset="Unknown")
+    assert params == "Write=1&StSt=1&PrNm=2&DelVl=0"
+
+
+def test_without_program_keeps_current_delay():
+    params = build_start_command({"Temp": "bad", "DelVal": "120"}, {})
+    assert params == "Write=1&StSt=1&DelVl=120"
+    assert STOP_COMMAND == "Write=1&StSt=0&DelMd=0"
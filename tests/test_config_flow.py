@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from unittest.mock import patch
 
 import pytest
@@ -32,6 +33,9 @@ class MockResponse:
     async def json(self, content_type=None):
         return self._json
 
+    async def read(self):
+        return json.dumps(self._json).encode()
+
 
 class MockSession:
     def __init__(self, response: MockResponse) -> None:
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+
+import pytest
+from aiohttp import web
+
+from custom_components.candy_bianca import coordinator as coordinator_module
+from custom_components.candy_bianca.const import (
+    ENDPOINT_STATISTICS,
+    OPTIONAL_ENDPOINT_GRACE,
+    STATISTICS_RETRY_INTERVAL,
+)
+from custom_components.candy_bianca.coordinator import compute_adaptive_interval
+
+from fake_washer import FakeWasher, FakeWasherConfig, FakeWasherFleet
+
+
+class NoCountersWasher(FakeWasher):
+    """Answers the status but fails every statistics request."""
+
+    def counters(self):
+        raise web.HTTPServiceUnavailable
+
+
+@pytest.mark.parametrize(
+    ("status", "min_interval", "max_interval", "expected"),
+    [
+        # Idle: standby, stopped or no status at all poll at the maximum
+        ({"MachMd": "0"}, 5, 300, 300),
+        ({"MachMd": "1"}, 5, 300, 300),
+        ({}, 5, 300, 300),
+        # Running
+        ({"MachMd": "2", "RemTime": "3600"}, 5, 300, 10),
+        ({"MachMd": "2"}, 5, 300, 10),
+        ({"MachMd": "4", "RemTime": "200"}, 5, 300, 30),
+        ({"MachMd": "5", "RemTime": "200"}, 5, 300, 120),
+        # Finishing: the last minutes poll at the minimum
+        ({"MachMd": "2", "RemTime": "300"}, 5, 300, 5),
+        ({"MachMd": "2", "RemTime": "0"}, 5, 300, 5),
+        ({"MachMd": "7"}, 5, 300, 60),
+        # Mode intervals stay within the configured bounds
+        ({"MachMd": "2", "RemTime": "3600"}, 15, 300, 15),
+        ({"MachMd": "5"}, 5, 60, 60),
+    ],
+)
+def test_adaptive_interval(status, min_interval, max_interval, expected):
+    assert compute_adaptive_interval(status, min_interval, max_interval) == expected
+
+
+@pytest.mark.asyncio
+async def test_statistics_are_cached_until_a_cycle_finishes(
+    hass, enable_custom_integrations, setup_washer
+):
+    washer = FakeWasher()
+    with FakeWasherFleet([washer]) as fleet:
+        entry, coordinator = await setup_washer(fleet.hosts[0])
+        coordinator.client.freshness = 0
+        assert washer.requests[ENDPOINT_STATISTICS] == 1
+
+        for mode in ("2", "4"):
+            washer.status()["MachMd"] = mode
+            await coordinator.async_refresh()
+            assert coordinator.data["statistics"] == {"totalWashCycles": "0"}
+        assert washer.requests[ENDPOINT_STATISTICS] == 1
+
+        washer.status()["MachMd"] = "7"
+        washer.counters()["totalWashCycles"] = "1"
+        await coordinator.async_refresh()
+        assert washer.requests[ENDPOINT_STATISTICS] == 2
+        assert coordinator.data["statistics"] == {"totalWashCycles": "1"}
+
+        # Still finished: nothing new to read
+        await coordinator.async_refresh()
+        assert washer.requests[ENDPOINT_STATISTICS] == 2
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_failed_statistics_are_retried_after_backoff(
+    hass, enable_custom_integrations, setup_washer, monkeypatch
+):
+    washer = NoCountersWasher()
+    with FakeWasherFleet([washer]) as fleet:
+        entry, coordinator = await setup_washer(fleet.hosts[0])
+        coordinator.client.freshness = 0
+        assert washer.requests[ENDPOINT_STATISTICS] == 1
+        assert "statistics" not in coordinator.data
+
+        await coordinator.async_refresh()
+        assert washer.requests[ENDPOINT_STATISTICS] == 1
+
+        monkeypatch.setattr(
+            coordinator_module,
+            "monotonic",
+            lambda: monotonic() + STATISTICS_RETRY_INTERVAL,
+        )
+        await coordinator.async_refresh()
+        assert washer.requests[ENDPOINT_STATISTICS] == 2
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_late_statistics_do_not_hold_back_the_status(
+    hass, enable_custom_integrations, setup_washer
+):
+    washer = FakeWasher(
+        FakeWasherConfig(statistics_latency=OPTIONAL_ENDPOINT_GRACE + 1)
+    )
+    with FakeWasherFleet([washer]) as fleet:
+        entry, coordinator = await setup_washer(fleet.hosts[0])
+        coordinator.client.freshness = 0
+        published: list[dict] = []
+        unsub = coordinator.async_add_listener(
+            lambda: published.append(coordinator.data["statistics"])
+        )
+
+        washer.status()["MachMd"] = "7"
+        washer.counters()["totalWashCycles"] = "1"
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await coordinator.async_refresh()
+
+        # The status is out after the grace period, with the cached counters
+        assert loop.time() - started < OPTIONAL_ENDPOINT_GRACE + 0.5
+        assert coordinator.data["MachMd"] == "7"
+        assert published == [{"totalWashCycles": "0"}]
+
+        await hass.async_block_till_done()
+        assert published[-1] == {"totalWashCycles": "1"}
+
+        unsub()
+        assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,145 @@
+"""Fleet-scale load benchmark against local fake washers.
+
+Tune with environment variables, e.g. for 200 washers over a minute:
+
+    CANDY_BENCH_WASHERS=200 CANDY_BENCH_SECONDS=60 \
+    CANDY_BENCH_OUTPUT=bench/fleet-0.4.0.json pytest tests/test_fleet_load.py --perf
+
+Results are written as JSON so runs of different releases can be compared.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from math import ceil
+from pathlib import Path
+
+import pytest
+
+from custom_components.candy_bianca.const import (
+    CONF_KEEP_ALIVE_INTERVAL,
+    CONF_SCAN_INTERVAL,
+)
+from custom_components.candy_bianca.metrics import KIND_READ
+
+from fake_washer import FakeWasher, FakeWasherConfig, FakeWasherFleet
+
+WASHERS = int(os.environ.get("CANDY_BENCH_WASHERS", "10"))
+SECONDS = float(os.environ.get("CANDY_BENCH_SECONDS", "5"))
+SCAN_INTERVAL = int(os.environ.get("CANDY_BENCH_SCAN_INTERVAL", "5"))
+KEEP_ALIVE_INTERVAL = int(os.environ.get("CANDY_BENCH_KEEP_ALIVE", "1"))
+WASHER_CONFIG = FakeWasherConfig(
+    latency=float(os.environ.get("CANDY_BENCH_LATENCY", "0.02")),
+    jitter=float(os.environ.get("CANDY_BENCH_JITTER", "0.01")),
+    failure_rate=float(os.environ.get("CANDY_BENCH_FAILURE_RATE", "0")),
+    single_connection=os.environ.get("CANDY_BENCH_SINGLE_CONNECTION", "1") == "1",
+)
+LAG_PROBE_INTERVAL = 0.01
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, ceil(q * len(ordered)) - 1)]
+
+
+def _ms(value: float | None) -> float | None:
+    return round(value * 1000, 2) if value is not None else None
+
+
+async def _probe_loop_lag(samples: list[float], stop: asyncio.Event) -> None:
+    """Measure how late the event loop wakes a short sleep."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        samples.append(loop.time() - start - LAG_PROBE_INTERVAL)
+
+
+@pytest.mark.perf
+@pytest.mark.asyncio
+async def test_fleet_polling_load(
+    hass, enable_custom_integrations, setup_washer, tmp_path
+):
+    washers = [FakeWasher(WASHER_CONFIG, seed=index) for index in range(WASHERS)]
+    with FakeWasherFleet(washers) as fleet:
+        entries = []
+        coordinators = []
+        for host in fleet.hosts:
+            entry, coordinator = await setup_washer(
+                host,
+                **{
+                    CONF_SCAN_INTERVAL: SCAN_INTERVAL,
+                    CONF_KEEP_ALIVE_INTERVAL: KEEP_ALIVE_INTERVAL,
+                },
+            )
+            entries.append(entry)
+            coordinators.append(coordinator)
+        requests_before = sum(c.client.requests for c in coordinators)
+        lag: list[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_loop_lag(lag, stop))
+        cpu_start = time.thread_time()
+        wall_start = time.monotonic()
+
+        await asyncio.sleep(SECONDS)
+
+        elapsed = time.monotonic() - wall_start
+        # Only the Home Assistant loop thread: the servers run in their own
+        cpu = time.thread_time() - cpu_start
+        stop.set()
+        await probe
+
+        requests = sum(c.client.requests for c in coordinators) - requests_before
+        poll_latency = [
+            wait + duration
+            for c in coordinators
+            for _epoch, kind, wait, duration, outcome in c.client.traces
+            if kind == KIND_READ and outcome == "ok"
+        ]
+        errors = sum(
+            metrics.errors for c in coordinators for metrics in c.client.metrics.values()
+        )
+        result = {
+            "washers": WASHERS,
+            "seconds": round(elapsed, 3),
+            "scan_interval": SCAN_INTERVAL,
+            "keep_alive_interval": KEEP_ALIVE_INTERVAL,
+            "washer_config": vars(WASHER_CONFIG),
+            "requests": requests,
+            "requests_per_second": round(requests / elapsed, 2),
+            "errors": errors,
+            "dropped_by_washers": sum(washer.dropped for washer in washers),
+            "loop_lag_ms": {
+                "p50": _ms(_percentile(lag, 0.5)),
+                "p99": _ms(_percentile(lag, 0.99)),
+                "max": _ms(max(lag, default=None)),
+            },
+            "poll_latency_ms": {
+                "p50": _ms(_percentile(poll_latency, 0.5)),
+                "p99": _ms(_percentile(poll_latency, 0.99)),
+            },
+            "cpu_ms_per_washer_second": round(cpu * 1000 / WASHERS / elapsed, 3),
+            "connections_created": sum(
+                c.client.connections_created for c in coordinators
+            ),
+            "connections_reused": sum(
+                c.client.connections_reused for c in coordinators
+            ),
+        }
+
+        for entry in entries:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    output = Path(os.environ.get("CANDY_BENCH_OUTPUT", tmp_path / "fleet_load.json"))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+
+    assert requests > 0
+    assert all(washer.requests for washer in washers)
+    # The integration must never open parallel connections to one washer
+    assert all(washer.max_concurrent == 1 for washer in washers)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+from time import perf_counter
+
+import pytest
+
+from custom_components.candy_bianca import payload
+from custom_components.candy_bianca.payload import PayloadHistory, get_section, loads
+
+READ_BODY = json.dumps(
+    {
+        "statusLavatrice": {
+            "WiFiStatus": "1",
+            "Err": "255",
+            "MachMd": "2",
+            "Pr": "1",
+            "PrPh": "2",
+            "SLevel": "0",
+            "Temp": "40",
+            "SpinSp": "12",
+            "Opt1": "0",
+            "Opt2": "0",
+            "Opt3": "0",
+            "Opt4": "0",
+            "Opt5": "0",
+            "Opt6": "0",
+            "Opt7": "0",
+            "Opt8": "0",
+            "Steam": "0",
+            "DryT": "0",
+            "DelVal": "0",
+            "RemTime": "4860",
+            "RecipeId": "0",
+            "CheckUpState": "0",
+            "PrCode": "65",
+            "T0W": "0",
+            "TIW": "0",
+            "T0R": "0",
+            "numF": "0",
+            "unbF": "0",
+            "unbC": "0",
+            "NtcW": "41",
+            "NtcD": "0",
+            "motS": "800",
+            "APSoff": "1",
+            "APSfreq": "0",
+            "chartL": "0",
+        }
+    }
+).encode()
+
+
+def _text_path(body: bytes):
+    """What aiohttp's resp.json(content_type=None) does."""
+    return json.loads(body.decode("utf-8"))
+
+
+def test_loads_matches_stdlib():
+    assert loads(READ_BODY) == _text_path(READ_BODY)
+
+
+def test_loads_falls_back_on_invalid_utf8():
+    data = loads(b'{"statusLavatrice": {"Name": "Lavatrice \xe0"}}')
+    assert get_section(data, "statusLavatrice") == {"Name": "Lavatrice �"}
+
+
+def test_loads_raises_value_error():
+    with pytest.raises(ValueError):
+        loads(b"<html>busy</html>")
+
+
+def test_get_section_only_checks_consumed_key():
+    assert get_section({"statusLavatrice": {}, "other": None}, "statusLavatrice") == {}
+    assert get_section({"statusLavatrice": []}, "statusLavatrice") is None
+    assert get_section({}, "statusLavatrice") is None
+    assert get_section([1, 2], "statusLavatrice") is None
+
+
+def test_payload_history_stays_within_budget():
+    history = PayloadHistory(max_entries=5, max_bytes=1000)
+    for _ in range(10):
+        history.add("http-read.json", 0.1, READ_BODY[:300])
+    assert len(history) == 3
+    assert history.size == 900
+
+    history.add("http-read.json", 0.1, READ_BODY * 4)
+    assert len(history) == 1
+    assert history.size == 1000
+
+
+def test_payload_history_keeps_a_ring_per_endpoint():
+    history = PayloadHistory(max_entries=5, max_bytes=1000)
+    history.add("http-getStatistics.json", 0.2, b'{"statusCounters": {}}')
+    for _ in range(50):
+        history.add("http-read.json", 0.1, READ_BODY[:100])
+
+    endpoints = [payload.endpoint for payload in history]
+    assert endpoints == ["http-getStatistics.json"] + ["http-read.json"] * 5
+    assert history.size == 22 + 500
+
+
+def _parse_cost(parse, rounds: int = 2000) -> tuple[float, int]:
+    """Return (best seconds per parse, peak bytes allocated by one parse)."""
+    best = float("inf")
+    for _ in range(5):
+        start = perf_counter()
+        for _ in range(rounds):
+            parse(READ_BODY)
+        best = min(best, perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        parse(READ_BODY)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best / rounds, peak
+
+
+@pytest.mark.perf
+@pytest.mark.skipif(payload.orjson is None, reason="orjson not installed")
+def test_fast_path_beats_text_decoding():
+    text_time, text_peak = _parse_cost(_text_path)
+    fast_time, fast_peak = _parse_cost(loads)
+
+    # orjson is usually 3-5x faster here; leave room for timer noise.
+    assert fast_time < text_time
+    assert fast_peak <= text_peak
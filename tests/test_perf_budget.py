@@ -0,0 +1,116 @@
+"""Per-refresh time and allocation budgets of the entity update pipeline.
+
+One refresh is measured end to end: decoding the raw body, building the
+WasherStatus snapshot (program matching included), diffing it, fanning out
+to every sensor/select/button entity and the timer/notification managers,
+and writing the resulting states. A change that makes this hot path slower
+or hungrier than the budgets below fails `pytest --perf`.
+"""
+from __future__ import annotations
+
+import json
+import tracemalloc
+from time import perf_counter
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from custom_components.candy_bianca.const import (
+    CONF_KEEP_ALIVE_UPDATES,
+    CONF_TIMER_ENTITY,
+)
+from custom_components.candy_bianca.payload import loads
+
+from washer_simulator import WashCycleSimulator
+
+ROUNDS = 200
+# Typical refresh during a cycle: only the remaining time (and now and then
+# the phase) changed, so a couple of entities are written.
+BUDGET_TICK_SECONDS = 0.002
+BUDGET_TICK_BYTES = 64 * 1024
+# Worst case: every field changed, every entity is written.
+BUDGET_FULL_SECONDS = 0.010
+BUDGET_FULL_BYTES = 256 * 1024
+
+
+async def _async_setup(hass, setup_washer):
+    async_mock_service(hass, "timer", "start")
+    async_mock_service(hass, "timer", "finish")
+    async_mock_service(hass, "timer", "cancel")
+    # Nothing listens there: the benchmark feeds the coordinator directly
+    return await setup_washer(
+        "127.0.0.1:9",
+        **{CONF_KEEP_ALIVE_UPDATES: True, CONF_TIMER_ENTITY: "timer.washer"},
+    )
+
+
+def _bodies(statuses: list[dict]) -> list[bytes]:
+    return [json.dumps({"statusLavatrice": status}).encode() for status in statuses]
+
+
+async def _measure(hass, coordinator, bodies: list[bytes]) -> tuple[float, int]:
+    """Return (seconds per refresh, peak bytes allocated by one refresh)."""
+
+    async def _refresh(body: bytes) -> None:
+        coordinator.async_handle_keep_alive(loads(body))
+        await hass.async_block_till_done()
+
+    # Warm up caches (program matching, state machine, translations)
+    for body in bodies[:10]:
+        await _refresh(body)
+
+    start = perf_counter()
+    for body in bodies[10:]:
+        await _refresh(body)
+    elapsed = (perf_counter() - start) / len(bodies[10:])
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for body in bodies[:10]:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            await _refresh(body)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+@pytest.mark.perf
+@pytest.mark.asyncio
+async def test_refresh_during_cycle_stays_within_budget(
+    hass, enable_custom_integrations, setup_washer
+):
+    entry, coordinator = await _async_setup(hass, setup_washer)
+    simulator = WashCycleSimulator()
+    simulator.start_preset("Cotone")
+    bodies = _bodies(list(simulator.timeline(1, until=ROUNDS + 10)))
+
+    elapsed, peak = await _measure(hass, coordinator, bodies)
+    assert elapsed < BUDGET_TICK_SECONDS
+    assert peak < BUDGET_TICK_BYTES
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.perf
+@pytest.mark.asyncio
+async def test_full_state_change_stays_within_budget(
+    hass, enable_custom_integrations, setup_washer
+):
+    entry, coordinator = await _async_setup(hass, setup_washer)
+    washing = WashCycleSimulator()
+    washing.start_preset("Cotone")
+    washing.clock.advance(600)
+    finished = WashCycleSimulator()
+    finished.start_preset("Asciugatura Misti (Pronto Stiro)")
+    finished.clock.advance(3 * 3600)
+    # Alternate two snapshots with (almost) no field in common
+    bodies = _bodies([washing.status(), finished.status()] * ((ROUNDS + 10) // 2))
+
+    elapsed, peak = await _measure(hass, coordinator, bodies)
+    assert elapsed < BUDGET_FULL_SECONDS
+    assert peak < BUDGET_FULL_BYTES
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.candy_bianca.const import (
+    DATA_PROFILER,
+    DOMAIN,
+    PROFILE_TOP_FUNCTIONS,
+)
+
+from fake_washer import FakeWasher, FakeWasherFleet
+
+
+async def _async_profile(hass, duration: float) -> dict:
+    return await hass.services.async_call(
+        DOMAIN,
+        "profile",
+        {"duration": duration},
+        blocking=True,
+        return_response=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_profile_reports_integration_functions(
+    hass, enable_custom_integrations, setup_washer
+):
+    with FakeWasherFleet([FakeWasher()]) as fleet:
+        entry, coordinator = await setup_washer(fleet.hosts[0])
+        profile = asyncio.create_task(_async_profile(hass, 1))
+        await asyncio.sleep(0.05)
+        await coordinator.async_refresh()
+        response = await profile
+
+        path = Path(response["file"])
+        assert path.is_file()
+        path.unlink()
+        assert response["duration"] == 1
+        functions = response["functions"]
+        assert 0 < len(functions) <= PROFILE_TOP_FUNCTIONS
+        assert any(f["function"].startswith("coordinator.py:") for f in functions)
+        cumulative = [f["cumulative_time"] for f in functions]
+        assert cumulative == sorted(cumulative, reverse=True)
+        assert DATA_PROFILER not in hass.data
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_profile_is_rejected(
+    hass, enable_custom_integrations, setup_washer
+):
+    with FakeWasherFleet([FakeWasher()]) as fleet:
+        entry, _ = await setup_washer(fleet.hosts[0])
+        profile = asyncio.create_task(_async_profile(hass, 1))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(HomeAssistantError, match="already running"):
+            await _async_profile(hass, 1)
+
+        Path((await profile)["file"]).unlink()
+        # The window is over: profiling may start again
+        Path((await _async_profile(hass, 1))["file"]).unlink()
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
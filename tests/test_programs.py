@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from custom_components.candy_bianca.programs import (
+    PROGRAM_MAPPINGS,
+    ProgramIndex,
+    ProgramMapping,
+    get_program_name,
+    get_program_short_name,
+)
+
+
+def _status(mapping: ProgramMapping) -> dict:
+    status = {"PrCode": str(mapping.code), "Pr": str(mapping.pr)}
+    if mapping.lvl is not None:
+        status["SLevel"] = str(mapping.lvl)
+    if mapping.dry is not None:
+        status["DryT"] = str(mapping.dry)
+    return status
+
+
+def test_every_mapping_matches_its_own_status():
+    for mapping in PROGRAM_MAPPINGS:
+        assert get_program_name(_status(mapping)) == mapping.full_name
+
+
+def test_unknown_or_invalid_status_is_other():
+    assert get_program_name({"PrCode": "999", "Pr": "1"}) == "Other"
+    assert get_program_name({"PrCode": "x", "Pr": "1"}) == "Other"
+    assert get_program_short_name({"PrCode": ["65"], "Pr": "1"}) == "Other"
+    assert get_program_short_name({}) == "Other"
+
+
+def test_rapid_variants_use_soil_level():
+    status = {"PrCode": "7", "Pr": "16", "SLevel": "2", "DryT": "0"}
+    assert get_program_short_name(status) == "Rapid 30"
+    status["SLevel"] = "9"
+    assert get_program_short_name(status) == "Other"
+
+
+def test_most_specific_mapping_wins_regardless_of_order():
+    generic = ProgramMapping(50, 3, None, None, "Generic", "G")
+    dry_only = ProgramMapping(50, 3, None, 1, "Dry", "D")
+    exact = ProgramMapping(50, 3, 2, 1, "Exact", "E")
+    index = ProgramIndex((generic, dry_only, exact))
+
+    assert index.lookup(50, 3, 2, 1) is exact
+    assert index.lookup(50, 3, 0, 1) is dry_only
+    assert index.lookup(50, 3, 0, 0) is generic
+
+
+def _synthetic_mappings(count: int) -> list[ProgramMapping]:
+    """Build a table of `count` programs, a few variants per code."""
+    mappings: list[ProgramMapping] = []
+    for i in range(count):
+        code, variant = divmod(i, 4)
+        mappings.append(
+            ProgramMapping(
+                1000 + code, code % 20, variant or None, None, f"P{i}", f"P{i}"
+            )
+        )
+    return mappings
+
+
+class _WatchedMapping(ProgramMapping):
+    """A mapping recording that a lookup compared its program code."""
+
+    compared: set[str] = set()
+
+    @property
+    def code(self) -> int:
+        _WatchedMapping.compared.add(self.full_name)
+        return self[0]
+
+
+def test_lookup_only_compares_variants_of_one_program():
+    mappings = [_WatchedMapping(*mapping) for mapping in _synthetic_mappings(800)]
+    index = ProgramIndex(mappings)
+    # Worst case for a linear scan: the last entry of the table
+    status = _status(mappings[-1])
+    _WatchedMapping.compared = set()
+
+    assert index.match(status) is mappings[-1]
+    # A linear scan would compare the code of every program before it
+    assert _WatchedMapping.compared <= {"P796", "P797", "P798", "P799"}
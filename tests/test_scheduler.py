@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.candy_bianca import scheduler as scheduler_module
+from custom_components.candy_bianca.const import SCHEDULER_JITTER
+from custom_components.candy_bianca.scheduler import CandyBiancaScheduler
+
+
+async def _idle() -> None:
+    return None
+
+
+@pytest.mark.asyncio
+async def test_phases_are_spread_over_the_interval(hass):
+    scheduler = CandyBiancaScheduler(hass)
+    for index in range(8):
+        scheduler.async_add_job(f"job {index}", _idle, lambda: 60)
+
+    phases = sorted(job["phase"] for job in scheduler.as_dict()["jobs"].values())
+    gaps = [b - a for a, b in zip(phases, phases[1:])] + [1 + phases[0] - phases[-1]]
+    # No two washers share a slot, none waits much longer than 1/n
+    assert min(gaps) > 0.5 / len(phases)
+    assert max(gaps) < 2 / len(phases)
+
+    for index in range(8):
+        scheduler.async_remove_job(f"job {index}")
+    assert scheduler.job_count == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shift", [-SCHEDULER_JITTER, SCHEDULER_JITTER])
+async def test_slots_are_jittered_within_bounds(hass, monkeypatch, shift):
+    monkeypatch.setattr(
+        scheduler_module, "random", SimpleNamespace(uniform=lambda low, high: shift)
+    )
+    scheduler = CandyBiancaScheduler(hass)
+    unsub = scheduler.async_add_job("job", _idle, lambda: 100)
+
+    next_run_in = scheduler.as_dict()["jobs"]["job"]["next_run_in"]
+    assert next_run_in == pytest.approx(100 * (1 + shift), abs=0.1)
+    unsub()
+
+
+@pytest.mark.asyncio
+async def test_requests_on_the_wire_are_capped(hass):
+    scheduler = CandyBiancaScheduler(hass, max_concurrent=2)
+    running = 0
+    peak = 0
+
+    async def _request() -> None:
+        nonlocal running, peak
+        async with scheduler.async_request_slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+
+    await asyncio.gather(*(_request() for _ in range(5)))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_job_does_not_starve_the_others(hass):
+    scheduler = CandyBiancaScheduler(hass, max_concurrent=1)
+    runs = 0
+
+    async def _slow() -> None:
+        # e.g. a refresh waiting for an unreachable washer's deadline
+        await asyncio.sleep(0.5)
+
+    async def _fast() -> None:
+        nonlocal runs
+        async with scheduler.async_request_slot():
+            runs += 1
+
+    unsubs = [
+        scheduler.async_add_job("slow", _slow, lambda: 0.05),
+        scheduler.async_add_job("fast", _fast, lambda: 0.05),
+    ]
+    await asyncio.sleep(0.3)
+    for unsub in unsubs:
+        unsub()
+    await asyncio.sleep(0.5)
+
+    assert runs >= 3
+
+
+@pytest.mark.asyncio
+async def test_highest_configured_limit_applies(hass):
+    scheduler = CandyBiancaScheduler(hass, max_concurrent=4)
+    scheduler.async_set_request_limit("entry a", 2)
+    assert scheduler.as_dict()["max_concurrent"] == 2
+    scheduler.async_set_request_limit("entry b", 6)
+    assert scheduler.as_dict()["max_concurrent"] == 6
+
+    scheduler.async_set_request_limit("entry b", None)
+    assert scheduler.as_dict()["max_concurrent"] == 2
+    scheduler.async_set_request_limit("entry a", None)
+    assert scheduler.as_dict()["max_concurrent"] == 4
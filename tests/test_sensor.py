@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.candy_bianca.const import DOMAIN
+
+from fake_washer import FakeWasher, FakeWasherFleet
+
+
+@pytest.mark.asyncio
+async def test_remaining_time_defaults_to_zero(
+    hass, enable_custom_integrations, setup_washer
+):
+    washer = FakeWasher()
+    del washer.status()["RemTime"]
+    with FakeWasherFleet([washer]) as fleet:
+        entry, coordinator = await setup_washer(fleet.hosts[0])
+        coordinator.client.freshness = 0
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "sensor", DOMAIN, f"{fleet.hosts[0]}_remtime"
+        )
+        assert hass.states.get(entity_id).state == "0"
+
+        for remaining, expected in (("4860", "81"), ("-1", "unknown")):
+            washer.status()["RemTime"] = remaining
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert hass.states.get(entity_id).state == expected
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import pytest
+import voluptuous as vol
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.candy_bianca.const import DOMAIN, MAX_PROFILE_DURATION
+
+from fake_washer import FakeWasher, FakeWasherConfig, FakeWasherFleet
+
+pytestmark = pytest.mark.usefixtures("fast_confirmation")
+
+
+async def _async_setup_fleet(setup_washer, hosts: list[str]) -> None:
+    for host in hosts:
+        await setup_washer(host)
+
+
+@pytest.mark.asyncio
+async def test_stop_area_runs_washers_concurrently(
+    hass, enable_custom_integrations, setup_washer
+):
+    washers = [FakeWasher(FakeWasherConfig(latency=0.2)) for _ in range(3)]
+    for washer in washers:
+        washer.command({"StSt": "1"})
+    with FakeWasherFleet(washers) as fleet:
+        await _async_setup_fleet(setup_washer, fleet.hosts)
+        area = ar.async_get(hass).async_create("Laundry")
+        device_registry = dr.async_get(hass)
+        for host in fleet.hosts[:2]:
+            device = device_registry.async_get_device(identifiers={(DOMAIN, host)})
+            device_registry.async_update_device(device.id, area_id=area.id)
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "stop",
+            {"area_id": area.id, "max_concurrent": 2},
+            blocking=True,
+            return_response=True,
+        )
+
+        results = response["washers"]
+        assert results.keys() == set(fleet.hosts[:2])
+        assert {result["result"] for result in results.values()} == {"confirmed"}
+        assert all(result["latency"] is not None for result in results.values())
+        assert [washer.status()["MachMd"] for washer in washers] == ["1", "1", "2"]
+
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_start_reports_confirmed_washer(
+    hass, enable_custom_integrations, setup_washer
+):
+    with FakeWasherFleet([FakeWasher()]) as fleet:
+        host = fleet.hosts[0]
+        entry, _ = await setup_washer(host)
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "sensor", DOMAIN, f"{host}_machmd"
+        )
+        response = await hass.services.async_call(
+            DOMAIN,
+            "start",
+            {"entity_id": entity_id, "program_preset": "Cotone"},
+            blocking=True,
+            return_response=True,
+        )
+
+        result = response["washers"][host]
+        assert result["result"] == "confirmed"
+        assert result["attempts"] == 1
+        assert result["error"] is None
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_start_reports_unreachable_washer(
+    hass, enable_custom_integrations, setup_washer
+):
+    # Nothing listens on the discard port: every request is refused
+    host = "127.0.0.1:9"
+    entry, _ = await setup_washer(host)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "start",
+        {"host": host, "timeout": 5},
+        blocking=True,
+        return_response=True,
+    )
+
+    result = response["washers"][host]
+    assert result["result"] == "failed"
+    assert result["error"]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_index_follows_registry_and_resolves_hosts(
+    hass, enable_custom_integrations, setup_washer
+):
+    with FakeWasherFleet([FakeWasher(), FakeWasher()]) as fleet:
+        await _async_setup_fleet(setup_washer, fleet.hosts)
+        entity_registry = er.async_get(hass)
+        entity_id = entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{fleet.hosts[0]}_machmd"
+        )
+        entity_registry.async_update_entity(entity_id, new_entity_id="sensor.washer")
+        await hass.async_block_till_done()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "stop",
+            {"entity_id": ["sensor.washer", entity_id], "host": fleet.hosts[1]},
+            blocking=True,
+            return_response=True,
+        )
+        # The old entity id is no longer a washer
+        assert response["washers"].keys() == set(fleet.hosts)
+
+        entry = hass.config_entries.async_entries(DOMAIN)[0]
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        response = await hass.services.async_call(
+            DOMAIN,
+            "stop",
+            {"entity_id": "sensor.washer", "host": fleet.hosts[1]},
+            blocking=True,
+            return_response=True,
+        )
+        assert response["washers"].keys() == {fleet.hosts[1]}
+
+        for entry in hass.config_entries.async_entries(DOMAIN)[1:]:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("service", "data"),
+    [
+        ("stop", {"max_concurrent": 0}),
+        ("stop", {"max_concurrent": -1}),
+        ("stop", {"timeout": "soon"}),
+        ("start", {"timeout": 0}),
+        ("start", {"program_preset": ["Cotone"]}),
+        ("profile", {"duration": -5}),
+        ("profile", {"duration": MAX_PROFILE_DURATION + 1}),
+    ],
+)
+async def test_invalid_service_data_is_rejected(
+    hass, enable_custom_integrations, setup_washer, service, data
+):
+    with FakeWasherFleet([FakeWasher()]) as fleet:
+        await _async_setup_fleet(setup_washer, fleet.hosts)
+        with pytest.raises(vol.Invalid):
+            await hass.services.async_call(
+                DOMAIN,
+                service,
+                {"host": fleet.hosts[0], **data} if service != "profile" else data,
+                blocking=True,
+                return_response=True,
+            )
+
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_start_clears_selects_without_status_change(
+    hass, enable_custom_integrations, setup_washer
+):
+    with FakeWasherFleet([FakeWasher()]) as fleet:
+        host = fleet.hosts[0]
+        await _async_setup_fleet(setup_washer, fleet.hosts)
+        entry = hass.config_entries.async_entries(DOMAIN)[0]
+        hass.data[DOMAIN][entry.entry_id]["test_mode"] = True
+        select_id = er.async_get(hass).async_get_entity_id(
+            "select", DOMAIN, f"{host}_temperature_select"
+        )
+        await hass.services.async_call(
+            "select",
+            "select_option",
+            {"entity_id": select_id, "option": "40"},
+            blocking=True,
+        )
+        assert hass.states.get(select_id).state == "40"
+
+        # Test mode: nothing is sent, the washer status does not change
+        await hass.services.async_call(
+            DOMAIN, "start", {"host": host}, blocking=True, return_response=True
+        )
+        await hass.async_block_till_done()
+
+        assert hass.states.get(select_id).state == "unknown"
+        assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from time import perf_counter
+
+import pytest
+from homeassistant.const import CONF_HOST
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+)
+
+from custom_components.candy_bianca.const import (
+    CONF_FINISH_NOTIFICATION,
+    CONF_SATELLITE_ENTITY,
+    CONF_TIMER_ENTITY,
+    DOMAIN,
+    PROGRAM_PRESETS,
+)
+from custom_components.candy_bianca.coordinator import CandyBiancaCoordinator
+from custom_components.candy_bianca.notifications import FinishNotificationManager
+from custom_components.candy_bianca.programs import get_program_name
+from custom_components.candy_bianca.wash_timer import WashTimerManager
+
+from washer_simulator import (
+    MODE_DELAYED,
+    MODE_FINISHED,
+    MODE_STOPPED,
+    MODE_WASHING,
+    PRESET_PROFILES,
+    WashCycleSimulator,
+)
+
+
+def test_every_preset_has_a_profile():
+    assert PRESET_PROFILES.keys() == PROGRAM_PRESETS.keys()
+
+
+@pytest.mark.parametrize("preset", list(PROGRAM_PRESETS))
+def test_preset_runs_to_completion(preset):
+    simulator = WashCycleSimulator()
+    simulator.start_preset(preset)
+
+    statuses = list(simulator.timeline(60))
+    modes = [int(status["MachMd"]) for status in statuses]
+    remaining = [int(status["RemTime"]) for status in statuses]
+
+    assert len(statuses) == PRESET_PROFILES[preset].minutes
+    assert set(modes[:-1]) == {MODE_WASHING}
+    assert modes[-1] == MODE_FINISHED
+    assert remaining == sorted(remaining, reverse=True)
+    assert get_program_name(statuses[0]) != "Other"
+    assert sum(int(value) for value in simulator.counters().values()) == 1
+
+
+def test_cotone_cycle_replays_in_milliseconds():
+    simulator = WashCycleSimulator()
+    simulator.start_preset("Cotone")
+
+    start = perf_counter()
+    statuses = list(simulator.timeline(1))
+    elapsed = perf_counter() - start
+
+    assert len(statuses) == 3 * 3600
+    assert statuses[-1]["MachMd"] == str(MODE_FINISHED)
+    assert elapsed < 0.5
+
+
+def test_delayed_start_counts_down_then_washes():
+    simulator = WashCycleSimulator()
+    simulator.start_preset("Lana", delay_minutes=30)
+
+    status = simulator.status()
+    assert status["MachMd"] == str(MODE_DELAYED)
+    assert status["DelVal"] == "30"
+
+    simulator.clock.advance(29 * 60 + 30)
+    assert simulator.status()["DelVal"] == "1"
+    simulator.clock.advance(30)
+    assert simulator.status()["MachMd"] == str(MODE_WASHING)
+
+
+def test_stop_mid_cycle_does_not_count():
+    simulator = WashCycleSimulator()
+    simulator.start_preset("Delicati")
+    simulator.clock.advance(10 * 60)
+    simulator.command("Write=1&StSt=0&DelMd=0")
+    simulator.clock.advance(3600)
+
+    assert simulator.status()["MachMd"] == str(MODE_STOPPED)
+    assert simulator.counters() == {}
+
+
+@pytest.mark.asyncio
+async def test_managers_follow_a_simulated_cycle(hass):
+    announcements = async_mock_service(hass, "assist_satellite", "send_text")
+    timer_starts = async_mock_service(hass, "timer", "start")
+    timer_finishes = async_mock_service(hass, "timer", "finish")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "1.2.3.4"},
+        options={
+            CONF_FINISH_NOTIFICATION: True,
+            CONF_SATELLITE_ENTITY: "assist_satellite.kitchen",
+            CONF_TIMER_ENTITY: "timer.washer",
+        },
+    )
+    coordinator = CandyBiancaCoordinator(hass, entry)
+    notifications = FinishNotificationManager(hass, entry.options, coordinator)
+    timer = WashTimerManager(hass, entry.options, coordinator)
+
+    simulator = WashCycleSimulator()
+    coordinator.async_set_updated_data(simulator.status())
+    simulator.start_preset("Perfect Rapid 30 Min.")
+    for status in simulator.timeline(30, until=simulator.clock() + 40 * 60):
+        coordinator.async_set_updated_data(status)
+        await hass.async_block_till_done()
+
+    assert len(announcements) == 1
+    assert "Perfect Rapid 30 Min." in announcements[0].data["text"]
+    assert timer_starts
+    assert len(timer_finishes) == 1
+
+    notifications.async_unload()
+    timer.async_unload()
+    await coordinator.async_shutdown()
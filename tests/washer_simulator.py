@@ -0,0 +1,224 @@
+"""Stateful Candy Bianca wash-cycle simulator running on a virtual clock.
+
+The washer state is computed from the clock on demand, so advancing the
+clock by three hours costs the same as advancing it by one second: a whole
+cycle can be sampled at any resolution in milliseconds.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterator
+from urllib.parse import parse_qsl
+
+from custom_components.candy_bianca.const import PROGRAM_PRESETS
+
+from fake_washer import FakeWasher, FakeWasherConfig
+
+# Machine modes (MachMd) and phases (PrPh) as reported by the washer
+MODE_STOPPED = 1
+MODE_WASHING = 2
+MODE_PAUSED = 4
+MODE_DELAYED = 5
+MODE_FINISHED = 7
+PHASE_IDLE = 0
+PHASE_WASH = 2
+PHASE_RINSE = 3
+PHASE_SPIN = 4
+PHASE_END = 5
+PHASE_DRYING = 6
+PHASE_STEAM = 7
+
+_WASH = ((PHASE_WASH, 0.55), (PHASE_RINSE, 0.3), (PHASE_SPIN, 0.15))
+
+
+@dataclass(frozen=True)
+class CycleProfile:
+    """Duration and phase breakdown of one program."""
+
+    minutes: int
+    phases: tuple[tuple[int, float], ...] = _WASH
+
+
+# Realistic durations for every preset the integration can start
+PRESET_PROFILES: dict[str, CycleProfile] = {
+    "Perfect Rapid 14 Min.": CycleProfile(14),
+    "Perfect Rapid 30 Min.": CycleProfile(30),
+    "Perfect Rapid 44 Min.": CycleProfile(44),
+    "Perfect Rapid 59 Min.": CycleProfile(59),
+    "Asciugatura Misti (Extra Asciutto)": CycleProfile(150, ((PHASE_DRYING, 1.0),)),
+    "Asciugatura Misti (Pronto Stiro)": CycleProfile(110, ((PHASE_DRYING, 1.0),)),
+    "Asciugatura Misti (Pronto Armadio)": CycleProfile(130, ((PHASE_DRYING, 1.0),)),
+    "Cotone": CycleProfile(180),
+    "Lana": CycleProfile(60),
+    "Delicati": CycleProfile(50),
+    "Risciacquo (freddo)": CycleProfile(20, ((PHASE_RINSE, 0.7), (PHASE_SPIN, 0.3))),
+    "Scarico + Centrifuga": CycleProfile(15, ((PHASE_SPIN, 1.0),)),
+    "Programma Vapore (Steam/Refresh)": CycleProfile(20, ((PHASE_STEAM, 1.0),)),
+}
+DEFAULT_PROFILE = CycleProfile(90)
+
+
+class VirtualClock:
+    """Monotonic clock advanced explicitly by the test."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class WashCycleSimulator:
+    """One washer reacting to http-write.json commands.
+
+    Start commands (`StSt=1`) select the program from `PrNm`/`PrCode`/
+    `SLevTgt`/`Dry` (as sent by the presets), optionally delayed by `DelVl`
+    minutes; `StSt=0` stops the machine. The usage counters increase when
+    a cycle completes.
+    """
+
+    def __init__(self, clock: VirtualClock | None = None) -> None:
+        self.clock = clock or VirtualClock()
+        self.program: dict[str, str] = {
+            "Pr": "1",
+            "PrCode": "65",
+            "SLevel": "0",
+            "DryT": "0",
+        }
+        self.temperature = 40
+        self.spin = 10
+        self.profile = DEFAULT_PROFILE
+        self.cycles: dict[str, int] = {}
+        self._start_at: float | None = None  # cycle start, after any delay
+        self._stopped = True
+        self._counted = False
+
+    @property
+    def duration(self) -> float:
+        return self.profile.minutes * 60
+
+    def command(self, params: dict[str, str] | str) -> None:
+        """Apply the query parameters of a http-write.json request."""
+        if isinstance(params, str):
+            params = dict(parse_qsl(params))
+        if params.get("StSt") == "0":
+            self._sync_counters()
+            self._stopped = True
+            self._start_at = None
+            return
+        if params.get("StSt") != "1":
+            return
+
+        self._sync_counters()
+        if "PrNm" in params:
+            self.program = {
+                "Pr": params["PrNm"],
+                "PrCode": params.get("PrCode", "0"),
+                "SLevel": params.get("SLevTgt", "0"),
+                "DryT": params.get("Dry", "0"),
+            }
+            self.profile = self._profile_for(params)
+        self.temperature = int(params.get("TmpTgt", self.temperature))
+        self.spin = int(params.get("SpdTgt", self.spin))
+        self._start_at = self.clock() + int(params.get("DelVl", 0)) * 60
+        self._stopped = False
+        self._counted = False
+
+    def start_preset(self, preset: str, delay_minutes: int = 0) -> None:
+        """Start a preset the way the start service does."""
+        self.command(f"Write=1&StSt=1&{PROGRAM_PRESETS[preset]}&DelVl={delay_minutes}")
+
+    def status(self) -> dict[str, str]:
+        """Return the statusLavatrice payload at the current clock time."""
+        mode, phase, remaining, delay = self._state(self.clock())
+        return {
+            "WiFiStatus": "1",
+            "Err": "0",
+            "MachMd": str(mode),
+            "PrPh": str(phase),
+            "RemTime": str(remaining),
+            "DelVal": str(delay),
+            "Temp": str(self.temperature),
+            "SpinSp": str(self.spin),
+            "Steam": "1" if phase == PHASE_STEAM else "0",
+            **self.program,
+        }
+
+    def counters(self) -> dict[str, str]:
+        """Return the statusCounters payload at the current clock time."""
+        self._sync_counters()
+        return {key: str(value) for key, value in self.cycles.items()}
+
+    def timeline(
+        self, step: float, until: float | None = None
+    ) -> Iterator[dict[str, str]]:
+        """Advance the clock by `step` and yield the status, until finished."""
+        end = until if until is not None else self._finish_at()
+        while self.clock() < end:
+            self.clock.advance(step)
+            yield self.status()
+
+    def _finish_at(self) -> float:
+        if self._start_at is None:
+            return self.clock()
+        return self._start_at + self.duration
+
+    def _state(self, now: float) -> tuple[int, int, int, int]:
+        if self._stopped or self._start_at is None:
+            return MODE_STOPPED, PHASE_IDLE, 0, 0
+        if now < self._start_at:
+            delay_minutes = -(-int(self._start_at - now) // 60)
+            return MODE_DELAYED, PHASE_IDLE, int(self.duration), delay_minutes
+        elapsed = now - self._start_at
+        if elapsed >= self.duration:
+            return MODE_FINISHED, PHASE_END, 0, 0
+
+        progress = elapsed / self.duration
+        phase = self.profile.phases[-1][0]
+        for candidate, share in self.profile.phases:
+            if progress < share:
+                phase = candidate
+                break
+            progress -= share
+        return MODE_WASHING, phase, int(self.duration - elapsed), 0
+
+    def _sync_counters(self) -> None:
+        if self._counted or self._start_at is None or self._stopped:
+            return
+        if self.clock() >= self._finish_at():
+            key = f"PrNm{self.program['Pr']}"
+            self.cycles[key] = self.cycles.get(key, 0) + 1
+            self._counted = True
+
+    @staticmethod
+    def _profile_for(params: dict[str, str]) -> CycleProfile:
+        for preset, payload in PROGRAM_PRESETS.items():
+            codes = {k: v for k, v in parse_qsl(payload) if k != "PrStr"}
+            if all(params.get(key) == value for key, value in codes.items()):
+                return PRESET_PROFILES[preset]
+        return DEFAULT_PROFILE
+
+
+class SimulatedWasher(FakeWasher):
+    """Fake washer server backed by a wash-cycle simulator."""
+
+    def __init__(
+        self,
+        simulator: WashCycleSimulator | None = None,
+        config: FakeWasherConfig | None = None,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(config, seed)
+        self.simulator = simulator or WashCycleSimulator()
+
+    def status(self) -> dict[str, Any]:
+        return self.simulator.status()
+
+    def counters(self) -> dict[str, Any]:
+        return self.simulator.counters()
+
+    def command(self, params: dict[str, str]) -> None:
+        self.simulator.command(params)